@@ -0,0 +1,165 @@
+"""
+Benchmark: memory of the cleaned_stats_cons output, object columns with
+None (before) vs nullable Int64 / Float64 / string[pyarrow] / date32
+columns (after).
+
+Runs both cleaned_stats_cons transforms on the synthetic payload of
+bench_flatten_stats_cons.py scaled to N x the national candidate count and
+reports the DataFrame's deep memory usage and the peak RSS growth of the
+transform. "object" is a copy of the transform before nullable dtypes
+(object string arrays, a Python date ingestion_date, to_python_nulls at
+the end). Every measurement runs in a fresh process.
+
+    PYTHONPATH=. python benchmarks/bench_cleaned_memory.py --scales 1 10 100
+"""
+import argparse
+import multiprocessing as mp
+import resource
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_flatten_stats_cons import synthetic_payload
+from dagster_code.bronze_store import snapshot_of
+from dagster_code.flatten import CASTS, is_blank, to_python_nulls
+from dagster_code.schemas import SCHEMAS
+
+
+FILE_KEY = "bronze/stats_cons/ingestion_date=2026-02-08/20260208T190000_bench.json"
+INGESTION_DATE = date(2026, 2, 8)
+
+
+def cleaned(provinces):
+    df = SCHEMAS["stats_cons"].transform({"result_province": provinces}, INGESTION_DATE)
+    return df.assign(**snapshot_of(FILE_KEY))
+
+
+# --- original implementation (cleaned_stats_cons before nullable dtypes)
+
+def as_object_strings(series, null):
+    strings = series.astype(str).to_numpy(dtype=object)
+    return pd.array(np.where(null, None, strings), dtype=object)
+
+
+def to_object_id(values):
+    series = pd.Series(values, dtype=object)
+    return as_object_strings(series, is_blank(series))
+
+
+def to_object_str(values):
+    series = pd.Series(values, dtype=object)
+    return as_object_strings(series, series.isna())
+
+
+def to_object_joined(values):
+    return pd.array(
+        [", ".join(map(str, v)) if isinstance(v, list) else None for v in values],
+        dtype=object,
+    )
+
+
+OBJECT_CASTS = {
+    **CASTS,
+    "id": to_object_id,
+    "str": to_object_str,
+    "joined": to_object_joined,
+}
+
+
+def flatten_objects(records, levels, types):
+    items = records
+    columns = {}
+
+    for depth, (child_key, fields) in enumerate(levels):
+        if depth > 0:
+            children = [item.get(child_key) or [] for item in items]
+            counts = np.fromiter((len(c) for c in children), dtype=np.int64, count=len(children))
+            parent = np.repeat(np.arange(len(items)), counts)
+
+            columns = {name: values.take(parent) for name, values in columns.items()}
+            items = [child for group in children for child in group]
+
+        for name, source in fields.items():
+            cast = OBJECT_CASTS[types.get(name, "str")]
+            columns[name] = cast([item.get(source) for item in items])
+
+    return pd.DataFrame(columns)
+
+
+def cleaned_objects(provinces):
+    dataset = SCHEMAS["stats_cons"]
+    records = dataset.records({"result_province": provinces})
+
+    df = flatten_objects(records, dataset.levels, dataset.types)
+    df["ingestion_date"] = INGESTION_DATE
+
+    for column in dataset.columns:
+        if column.default is not None:
+            df[column.name] = df[column.name].fillna(column.default)
+
+    df = df[dataset.column_names].assign(**snapshot_of(FILE_KEY))
+
+    # The NaN → None format prevents Trino errors
+    return to_python_nulls(df)
+
+
+IMPLEMENTATIONS = {
+    "object": cleaned_objects,
+    "nullable": cleaned,
+}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(name, scale, queue):
+    provinces = synthetic_payload(scale)
+    baseline = peak_rss_mb()
+
+    started = time.perf_counter()
+    df = IMPLEMENTATIONS[name](provinces)
+    elapsed = time.perf_counter() - started
+
+    memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    queue.put((len(df), elapsed, memory_mb, peak_rss_mb() - baseline))
+
+
+def measure(name, scale):
+    queue = mp.Queue()
+    proc = mp.Process(target=run_one, args=(name, scale, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def check_equivalent():
+    provinces = synthetic_payload(1)
+    objects = cleaned_objects(provinces)
+    nullable = cleaned(provinces)
+
+    # same values and nulls, no object column left
+    assert objects.isna().sum().tolist() == nullable.isna().sum().tolist()
+    assert objects.values.tolist() == to_python_nulls(nullable).values.tolist()
+    assert not (nullable.dtypes == object).any(), nullable.dtypes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    check_equivalent()
+
+    print(f"{'scale':>6} {'impl':>9} {'rows':>10} {'seconds':>9} {'frame MB':>9} {'peak RSS +MB':>13}")
+    for scale in args.scales:
+        for name in IMPLEMENTATIONS:
+            rows, elapsed, memory, rss = measure(name, scale)
+            print(f"{scale:>6} {name:>9} {rows:>10} {elapsed:>9.3f} {memory:>9.1f} {rss:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
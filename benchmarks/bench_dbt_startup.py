@@ -0,0 +1,87 @@
+"""
+Benchmark: code location load time and dbt invocation overhead.
+
+Code location: seconds to import dagster_code.definitions and build the
+repository in a fresh process, with the prepared manifest and with a
+stale one (no target/manifest.hash, the load parses the project first).
+
+dbt invocation: seconds of a `dbt parse` started the way dagster-dbt
+starts a build (fresh target path seeded with target/partial_parse.msgpack)
+for consecutive partitions, with the ingestion date passed as --vars, as
+builds did before, and as the DBT_INGESTION_DATE env var.
+
+    PYTHONPATH=. python benchmarks/bench_dbt_startup.py --runs 3
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from dagster_code.dbt_build import INGESTION_DATE_ENV
+from dagster_code.dbt_manifest import DBT_PROJECT_DIR, TARGET_PATH, hash_path, prepare_manifest
+
+
+LOAD_CODE_LOCATION = (
+    "from dagster_code.definitions import defs; defs.get_repository_def()"
+)
+
+
+def timed_process(args, env=None):
+    started = time.perf_counter()
+    subprocess.run(args, env={**os.environ, **(env or {})}, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def code_location_seconds(stale):
+    if stale:
+        hash_path().unlink(missing_ok=True)
+    else:
+        prepare_manifest()
+    return timed_process([sys.executable, "-c", LOAD_CODE_LOCATION])
+
+
+def dbt_parse_seconds(ingestion_date, use_vars):
+    target = tempfile.mkdtemp(dir=DBT_PROJECT_DIR / TARGET_PATH)
+    shutil.copy(DBT_PROJECT_DIR / TARGET_PATH / "partial_parse.msgpack", target)
+
+    args = [shutil.which("dbt"), "parse", "--target-path", target]
+    env = {}
+    if use_vars:
+        args += ["--vars", json.dumps({"ingestion_date": ingestion_date})]
+    else:
+        env[INGESTION_DATE_ENV] = ingestion_date
+
+    try:
+        return timed_process(args, env)
+    finally:
+        shutil.rmtree(target)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(DBT_PROJECT_DIR)
+    days = [(date(2026, 2, 8) + timedelta(days=i)).isoformat() for i in range(args.runs)]
+
+    print(f"{'measure':>16} {'variant':>18} {'median s':>9} {'min s':>7}")
+
+    for name, stale in (("stale manifest", True), ("prepared manifest", False)):
+        seconds = [code_location_seconds(stale) for _ in range(args.runs)]
+        print(f"{'code location':>16} {name:>18} {statistics.median(seconds):>9.2f} {min(seconds):>7.2f}")
+
+    prepare_manifest()
+    for name, use_vars in (("--vars per run", True), ("env var per run", False)):
+        seconds = [dbt_parse_seconds(day, use_vars) for day in days]
+        print(f"{'dbt invocation':>16} {name:>18} {statistics.median(seconds):>9.2f} {min(seconds):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
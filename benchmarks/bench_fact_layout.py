@@ -0,0 +1,157 @@
+"""
+Benchmark: file and row group pruning of Iceberg table layouts.
+
+Copies a table (iceberg.silver.ods_stats_cons_snapshot by default, every
+snapshot of the count) into one scratch table per layout and row group
+size in iceberg.bench, then runs the typical dashboard filters against
+each copy and reports what Trino actually read: splits, physical input
+bytes and rows. Needs a running Trino with loaded data:
+
+    PYTHONPATH=. TRINO_HOST=localhost python benchmarks/bench_fact_layout.py \
+        --row-group-sizes 128MB 8MB --runs 3
+"""
+import argparse
+import os
+import statistics
+
+from dagster_code.trino_client import TrinoClient
+
+
+BENCH_SCHEMA = "iceberg.bench"
+
+LAYOUTS = {
+    "unsorted": {
+        "partitioning": ["ingestion_date"],
+        "sorted_by": [],
+    },
+    "sorted": {
+        "partitioning": ["ingestion_date"],
+        "sorted_by": ["province_id", "constituency_id"],
+    },
+    "bucketed": {
+        "partitioning": ["ingestion_date", "bucket(province_id, 8)"],
+        "sorted_by": ["province_id", "constituency_id"],
+    },
+}
+
+# dashboard filters: one province, one party across provinces, winners
+QUERIES = {
+    "by_province": """
+        SELECT party_id, sum(vote) FROM {table}
+        WHERE province_id = '{province_id}'
+        GROUP BY party_id
+    """,
+    "by_party": """
+        SELECT province_id, sum(vote) FROM {table}
+        WHERE party_id = {party_id}
+        GROUP BY province_id
+    """,
+    "top_winners": """
+        SELECT constituency_id, party_id, vote FROM {table}
+        WHERE rank = 1
+        ORDER BY vote DESC
+        LIMIT 10
+    """,
+}
+
+
+def run(trino, sql):
+    cursor = trino.cursor()
+    cursor.execute(sql)
+    rows = cursor.fetchall()
+    return rows, cursor.stats
+
+
+def array(values):
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+def create_copy(trino, source, table, layout, row_group_size):
+    run(trino, f"DROP TABLE IF EXISTS {table}")
+
+    properties = [
+        "format = 'PARQUET'",
+        f"partitioning = {array(layout['partitioning'])}",
+    ]
+    if layout["sorted_by"]:
+        properties.append(f"sorted_by = {array(layout['sorted_by'])}")
+
+    with trino.session({"iceberg.parquet_writer_block_size": row_group_size}) as writer:
+        run(writer, f"""
+            CREATE TABLE {table}
+            WITH ({", ".join(properties)})
+            AS SELECT * FROM {source}
+        """)
+
+    schema, name = table.rsplit(".", 1)
+    rows, _ = run(trino, f"""
+        SELECT count(*), sum(cardinality(split_offsets)), sum(file_size_in_bytes)
+        FROM {schema}."{name}$files"
+    """)
+    return rows[0]
+
+
+def measure(trino, sql, runs):
+    stats = [run(trino, sql)[1] for _ in range(runs)]
+
+    return {
+        "splits": stats[-1]["totalSplits"],
+        "input_bytes": stats[-1]["physicalInputBytes"],
+        "rows": stats[-1]["processedRows"],
+        "elapsed_ms": statistics.median(s["elapsedTimeMillis"] for s in stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", default="iceberg.silver.ods_stats_cons_snapshot")
+    parser.add_argument("--row-group-sizes", nargs="+", default=["128MB", "8MB"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables")
+    args = parser.parse_args()
+
+    trino = TrinoClient({
+        "host": os.getenv("TRINO_HOST", "localhost"),
+        "port": int(os.getenv("TRINO_PORT", 8080)),
+        "user": os.getenv("TRINO_USER", "admin"),
+        "catalog": "iceberg",
+        "schema": "silver",
+    })
+
+    with trino:
+        run(trino, f"CREATE SCHEMA IF NOT EXISTS {BENCH_SCHEMA}")
+
+        rows, _ = run(trino, f"SELECT min(province_id), min(party_id) FROM {args.source}")
+        province_id, party_id = rows[0]
+
+        tables = []
+        print(f"{'layout':>10} {'row group':>10} {'files':>6} {'row groups':>11} {'MB':>8}")
+        for name, layout in LAYOUTS.items():
+            for size in args.row_group_sizes:
+                table = f"{BENCH_SCHEMA}.{name}_{size.lower()}"
+                files, row_groups, size_bytes = create_copy(trino, args.source, table, layout, size)
+                print(f"{name:>10} {size:>10} {files:>6} {row_groups:>11} {size_bytes / 1e6:>8.1f}")
+                tables.append((name, size, table))
+
+        print()
+        print(
+            f"{'query':>12} {'layout':>10} {'row group':>10} {'splits':>7} "
+            f"{'input MB':>9} {'rows read':>11} {'ms':>7}"
+        )
+        for query, template in QUERIES.items():
+            for name, size, table in tables:
+                sql = template.format(table=table, province_id=province_id, party_id=party_id)
+                result = measure(trino, sql, args.runs)
+                print(
+                    f"{query:>12} {name:>10} {size:>10} {result['splits']:>7} "
+                    f"{result['input_bytes'] / 1e6:>9.2f} {result['rows']:>11,} "
+                    f"{result['elapsed_ms']:>7.0f}"
+                )
+
+        if not args.keep:
+            for _, _, table in tables:
+                run(trino, f"DROP TABLE IF EXISTS {table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark: columnar stats_cons flattening vs the original nested loops.
+
+Builds a synthetic stats_cons payload scaled to N x the national candidate
+count (77 provinces, 400 constituencies, ~9 candidates each) and reports
+rows/sec and peak RSS growth of each implementation. Every measurement runs
+in a fresh process so the RSS high-water marks do not leak into each other.
+
+    PYTHONPATH=. python benchmarks/bench_flatten_stats_cons.py --scales 1 10 100
+"""
+import argparse
+import multiprocessing as mp
+import random
+import resource
+import time
+
+import pandas as pd
+
+from dagster_code.flatten import flatten_nested, to_python_nulls
+from dagster_code.schemas import SCHEMAS
+
+
+PROVINCES = 77
+CONSTITUENCIES = 400
+CANDIDATES_PER_CONS = 9
+
+
+def synthetic_payload(scale, seed=0):
+    rnd = random.Random(seed)
+    n_cons = CONSTITUENCIES * scale
+
+    provinces = [{"prov_id": f"{p:02d}", "constituencies": []} for p in range(PROVINCES)]
+
+    for c in range(n_cons):
+        valid = rnd.randint(50_000, 150_000)
+        provinces[c % PROVINCES]["constituencies"].append({
+            "cons_id": f"{c % PROVINCES:02d}_{c}",
+            # the live feed mixes numbers, numeric strings and blanks,
+            # fractional ones included (int("12.7") fails, int(12.7) is 12)
+            "turn_out": str(valid + rnd.randint(0, 5_000)),
+            "percent_turn_out": round(rnd.uniform(50, 90), 2),
+            "valid_votes": rnd.choice([valid, float(valid) + 0.5]),
+            "invalid_votes": rnd.choice([rnd.randint(0, 3_000), "", None]),
+            "blank_votes": rnd.choice([str(rnd.randint(0, 2_000)), f"{rnd.uniform(0, 2_000):.1f}"]),
+            "candidates": [
+                {
+                    "party_id": rnd.choice([rnd.randint(1, 60), None]),
+                    "mp_app_vote": rnd.randint(0, valid),
+                    "mp_app_vote_percent": rnd.choice([round(rnd.uniform(0, 60), 2), ""]),
+                    "mp_app_rank": k + 1,
+                }
+                for k in range(CANDIDATES_PER_CONS)
+            ],
+        })
+
+    return provinces
+
+
+# --- original implementation (cleaned_stats_cons before the columnar engine)
+
+def safe_int(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (ValueError, TypeError):
+        return None
+
+
+def safe_float(value):
+    try:
+        return float(value) if value not in (None, "") else None
+    except (ValueError, TypeError):
+        return None
+
+
+def flatten_loop(provinces):
+    rows = []
+
+    for province in provinces:
+        prov_raw = province.get("prov_id")
+        province_id = str(prov_raw) if prov_raw not in (None, "") else None
+
+        for cons in province.get("constituencies", []):
+            cons_raw = cons.get("cons_id")
+            constituency_id = str(cons_raw) if cons_raw not in (None, "") else None
+
+            turn_out = safe_int(cons.get("turn_out"))
+            percent_turn_out = safe_float(cons.get("percent_turn_out"))
+            valid_votes = safe_int(cons.get("valid_votes"))
+            invalid_votes = safe_int(cons.get("invalid_votes"))
+            blank_votes = safe_int(cons.get("blank_votes"))
+
+            for candidate in cons.get("candidates", []):
+                rows.append({
+                    "constituency_id": constituency_id,
+                    "province_id": province_id,
+                    "party_id": safe_int(candidate.get("party_id")),
+                    "vote": safe_int(candidate.get("mp_app_vote")),
+                    "vote_percent": safe_float(candidate.get("mp_app_vote_percent")),
+                    "rank": safe_int(candidate.get("mp_app_rank")),
+                    "turn_out": turn_out,
+                    "percent_turn_out": percent_turn_out,
+                    "valid_votes": valid_votes,
+                    "invalid_votes": invalid_votes,
+                    "blank_votes": blank_votes,
+                })
+
+    df = pd.DataFrame(rows)
+    return df.where(pd.notnull(df), None)
+
+
+def flatten_columnar(provinces):
+    schema = SCHEMAS["stats_cons"]
+    return flatten_nested(provinces, schema.levels, schema.types)
+
+
+IMPLEMENTATIONS = {
+    "loop": flatten_loop,
+    "columnar": flatten_columnar,
+}
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(name, scale, queue):
+    provinces = synthetic_payload(scale)
+    baseline = peak_rss_mb()
+
+    started = time.perf_counter()
+    df = IMPLEMENTATIONS[name](provinces)
+    elapsed = time.perf_counter() - started
+
+    queue.put((len(df), elapsed, peak_rss_mb() - baseline))
+
+
+def measure(name, scale):
+    queue = mp.Queue()
+    proc = mp.Process(target=run_one, args=(name, scale, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def check_equivalent():
+    provinces = synthetic_payload(1)
+    expected = flatten_loop(provinces)
+    actual = to_python_nulls(flatten_columnar(provinces))[expected.columns]
+
+    assert expected.astype(object).where(expected.notna(), None).values.tolist() == actual.values.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    check_equivalent()
+
+    print(f"{'scale':>6} {'impl':>9} {'rows':>10} {'seconds':>9} {'rows/sec':>12} {'peak RSS +MB':>13}")
+    for scale in args.scales:
+        for name in IMPLEMENTATIONS:
+            rows, elapsed, rss = measure(name, scale)
+            print(f"{scale:>6} {name:>9} {rows:>10} {elapsed:>9.3f} {rows / elapsed:>12,.0f} {rss:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
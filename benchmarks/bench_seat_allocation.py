@@ -0,0 +1,137 @@
+"""
+Benchmark: vectorized seat allocation and Monte Carlo projection.
+
+Builds a synthetic national count (400 constituencies, ~60 parties,
+5-15 candidates each) and reports the time of a single allocation and of
+the Monte Carlo projection at several simulation counts, against a
+reference that loops over simulations and constituencies in Python.
+
+    PYTHONPATH=. python benchmarks/bench_seat_allocation.py --simulations 1000 10000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dagster_code import seats
+
+
+PARTIES = 60
+CONSTITUENCIES = 400
+PROVINCES = 77
+
+
+def synthetic_count(percent_count=55.5, seed=0):
+    rng = np.random.default_rng(seed)
+    popularity = rng.dirichlet(np.full(PARTIES, 0.5))
+
+    rows = []
+    for c in range(CONSTITUENCIES):
+        candidates = rng.integers(5, 16)
+        parties = rng.choice(np.arange(1, PARTIES + 1), candidates, replace=False, p=popularity)
+        votes = rng.multinomial(60_000, rng.dirichlet(popularity[parties - 1] * 50))
+        for party_id, vote in zip(parties, votes):
+            rows.append({
+                "constituency_id": f"{c % PROVINCES:02d}_{c}",
+                "party_id": int(party_id),
+                "vote": int(vote),
+            })
+
+    stats_cons = pd.DataFrame(rows).astype(object)
+    stats_party = pd.DataFrame({
+        "party_id": np.arange(1, PARTIES + 1),
+        "party_vote": rng.multinomial(20_000_000, popularity),
+        "percent_count": percent_count,
+    }).astype(object)
+
+    return stats_cons, stats_party
+
+
+# --- reference implementation, one simulation and constituency at a time
+
+def largest_remainder_loop(votes, seats_total=seats.PARTY_LIST_SEATS):
+    total = sum(votes)
+    quotas = [v * seats_total / total for v in votes]
+    allocated = [int(q) for q in quotas]
+    order = sorted(range(len(votes)), key=lambda i: -(quotas[i] - allocated[i]))
+    for i in order[:seats_total - sum(allocated)]:
+        allocated[i] += 1
+    return allocated
+
+
+def simulate_loop(stats_cons, stats_party, simulations, seed=0):
+    rng = np.random.default_rng(seed)
+    parties = seats.all_parties(stats_cons, stats_party)
+    _, votes, party_index = seats.constituency_matrix(stats_cons, parties)
+    list_votes = seats.party_votes(stats_party, parties)
+    counted = seats.share_counted(stats_party)
+
+    totals = []
+    for _ in range(simulations):
+        total = np.zeros(len(parties), dtype=np.int64)
+
+        for row, candidates in zip(votes, party_index):
+            present = candidates >= 0
+            final = row[present] + rng.dirichlet(
+                row[present] / row[present].sum() * seats.CONCENTRATION
+            ) * row[present].sum() * (1 - counted) / counted
+            total[candidates[present][final.argmax()]] += 1
+
+        present = list_votes > 0
+        final = list_votes.copy()
+        final[present] += rng.dirichlet(
+            list_votes[present] / list_votes.sum() * seats.CONCENTRATION
+        ) * list_votes.sum() * (1 - counted) / counted
+        total += largest_remainder_loop(list(final))
+
+        totals.append(total)
+
+    return np.array(totals)
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def check_equivalent(stats_cons, stats_party):
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        votes = rng.integers(0, 1_000_000, rng.integers(2, 80))
+        assert seats.largest_remainder(votes).tolist() == largest_remainder_loop(list(votes))
+
+    current = seats.allocate(stats_cons, stats_party)
+    assert current["constituency_seats"].sum() == seats.CONSTITUENCY_SEATS
+    assert current["party_list_seats"].sum() == seats.PARTY_LIST_SEATS
+
+    totals, _ = seats.simulate(stats_cons, stats_party, simulations=100, seed=0)
+    assert (totals.sum(axis=1) == seats.CONSTITUENCY_SEATS + seats.PARTY_LIST_SEATS).all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--simulations", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--loop-simulations", type=int, default=100)
+    args = parser.parse_args()
+
+    stats_cons, stats_party = synthetic_count()
+    check_equivalent(stats_cons, stats_party)
+
+    _, elapsed = timed(seats.allocate, stats_cons, stats_party)
+    print(f"single allocation: {elapsed * 1000:.2f} ms")
+    print()
+
+    print(f"{'impl':>10} {'simulations':>12} {'seconds':>9} {'sims/sec':>10}")
+
+    _, elapsed = timed(simulate_loop, stats_cons, stats_party, args.loop_simulations)
+    print(f"{'loop':>10} {args.loop_simulations:>12} {elapsed:>9.3f} {args.loop_simulations / elapsed:>10,.0f}")
+
+    for simulations in args.simulations:
+        _, elapsed = timed(seats.simulate, stats_cons, stats_party, simulations=simulations, seed=0)
+        print(f"{'vectorized':>10} {simulations:>12} {elapsed:>9.3f} {simulations / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from dagster import AssetKey, AssetObservation, AssetOut, Config, Output, multi_asset
+
+from dagster_code.bronze_store import (
+    BUCKET_NAME,
+    is_unchanged,
+    key_date,
+    key_for_date,
+    new_batch_id,
+    read_latest,
+    write_bronze,
+    write_date_pointer,
+)
+from dagster_code.ect_api import (
+    BACKOFF_SECONDS,
+    ENDPOINTS,
+    MAX_RETRIES,
+    create_session,
+    fetch_all,
+    snapshot_skew_seconds,
+)
+from dagster_code.live_count import is_live_run
+from dagster_code.partitions import daily_partitions, is_today, partition_date
+
+
+class RawElectionApiConfig(Config):
+    # 1 = fetch endpoints one after another
+    max_workers: int = len(ENDPOINTS)
+    max_retries: int = MAX_RETRIES
+    backoff_seconds: float = BACKOFF_SECONDS
+    # write a new bronze object even if the endpoint did not change
+    force: bool = False
+
+
+@multi_asset(
+    outs={
+        f"raw_{dataset}": AssetOut(group_name="bronze", is_required=False)
+        for dataset in ENDPOINTS
+    },
+    required_resource_keys={"s3"},
+    can_subset=True,
+    partitions_def=daily_partitions,
+)
+def raw_election_api(context, config: RawElectionApiConfig):
+    """
+    Bronze layer - all ECT endpoints (Raw JSON)
+
+    Every selected endpoint is fetched concurrently over one pooled
+    keep-alive session and written in a single step, so the snapshots
+    are taken at (almost) the same moment.
+
+    Requests are conditional on the validators of the last snapshot
+    (kept in the bronze manifest).
+    Endpoints that answer 304, or return the same content hash, are not
+    written again. In live-count runs their output is skipped when the
+    unchanged snapshot already belongs to today's partition. Otherwise the
+    snapshot is passed on, the new day's partition still gets loaded and
+    change detection and the dbt selection skip what did not change.
+
+    Only today's partition calls the API. Past partitions (backfills,
+    reruns of a bad day) replay the snapshot the day loaded, also when it
+    was reused from an earlier day.
+    """
+
+    datasets = [
+        dataset
+        for dataset in ENDPOINTS
+        if f"raw_{dataset}" in context.selected_output_names
+    ]
+
+    s3 = context.resources.s3
+    ingestion_date = partition_date(context)
+
+    if not is_today(ingestion_date):
+        yield from replay_partition(context, s3, datasets, ingestion_date)
+        return
+    latest = {} if config.force else {dataset: read_latest(s3, dataset) for dataset in datasets}
+
+    # Call API
+    with create_session() as session:
+        results = fetch_all(
+            session,
+            datasets,
+            validators=latest,
+            max_workers=config.max_workers,
+            max_retries=config.max_retries,
+            backoff_seconds=config.backoff_seconds,
+        )
+
+    skew = snapshot_skew_seconds(results)
+    context.log.info(f"Fetched {len(results)} endpoints, snapshot skew {skew:.3f}s")
+
+    # Upload
+    batch_id = new_batch_id()
+
+    try:
+        for dataset, result in results.items():
+            previous = latest.get(dataset)
+
+            if is_unchanged(result, previous):
+                # a skipped output also skips the dbt step, which reads every
+                # ods_* table: only live runs, one dataset each, skip
+                if key_date(previous["key"]) != context.partition_key or not is_live_run(context):
+                    context.log.info(f"{dataset} unchanged since {previous.get('timestamp')}, reusing it")
+                    write_date_pointer(s3, context.partition_key, previous)
+
+                    yield Output(
+                        previous["key"],
+                        output_name=f"raw_{dataset}",
+                        metadata={
+                            "unchanged": True,
+                            "file_key": previous["key"],
+                            "batch_id": previous.get("batch_id"),
+                            "content_hash": previous.get("content_hash"),
+                        },
+                    )
+                    continue
+
+                context.log.info(f"{dataset} unchanged since {previous.get('timestamp')}, skipping")
+
+                context.log_event(
+                    AssetObservation(
+                        asset_key=AssetKey(f"raw_{dataset}"),
+                        metadata={
+                            "unchanged": True,
+                            "status_code": result.status_code,
+                            "file_key": previous.get("key"),
+                            "content_hash": previous.get("content_hash"),
+                        },
+                    )
+                )
+                continue
+
+            entry = write_bronze(s3, result, batch_id)
+            write_date_pointer(s3, context.partition_key, entry)
+            file_key = entry["key"]
+
+            context.log.info(f"Saved to s3://{BUCKET_NAME}/{file_key}")
+
+            yield Output(
+                file_key,
+                output_name=f"raw_{dataset}",
+                metadata={
+                    "unchanged": False,
+                    "file_key": file_key,
+                    "batch_id": batch_id,
+                    "content_hash": result.content_hash,
+                    "raw_bytes": result.raw_bytes,
+                    "compressed_bytes": result.compressed_bytes,
+                    "fetched_at": result.fetched_at.isoformat() + "Z",
+                    "fetch_seconds": round(result.elapsed_seconds, 3),
+                    "attempts": result.attempts,
+                    "snapshot_skew_seconds": round(skew, 3),
+                },
+            )
+    finally:
+        for result in results.values():
+            result.close()
+
+
+def replay_partition(context, s3, datasets, ingestion_date):
+    """
+    Outputs for a past partition: the bronze snapshot that day loaded
+    (key_for_date), nothing is fetched. Datasets without any snapshot on
+    or before that day are skipped.
+    """
+    for dataset in datasets:
+        file_key = key_for_date(s3, dataset, ingestion_date)
+
+        if file_key is None:
+            context.log.warning(f"No bronze {dataset} snapshot on or before {ingestion_date}, skipping")
+            continue
+
+        context.log.info(f"Replaying s3://{BUCKET_NAME}/{file_key}")
+
+        yield Output(
+            file_key,
+            output_name=f"raw_{dataset}",
+            metadata={
+                "unchanged": True,
+                "replayed": True,
+                "file_key": file_key,
+            },
+        )
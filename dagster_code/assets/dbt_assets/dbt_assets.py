@@ -1,10 +1,57 @@
-from dagster_dbt import dbt_assets, DbtCliResource
+from dagster_dbt import dbt_assets
+
+from dagster_code.dbt_build import INGESTION_DATE_ENV, environment, model_stats
+from dagster_code.dbt_manifest import load_manifest
+from dagster_code.dbt_selection import current_state_models, unchanged_models
+from dagster_code.partitions import daily_partitions, is_today, partition_date
+
+
+# prepared at image build time (dagster_code/dbt_manifest.py)
+manifest = load_manifest()
+
 
 @dbt_assets(
-    manifest="/opt/dagster/app/dbt_election/target/manifest.json",
+    manifest=manifest,
+    # dbt_gold_assets builds the selected subset of these
+    select="gold",
+    partitions_def=daily_partitions,
+    required_resource_keys={"dbt", "trino"},
+    # one dbt build at a time (concurrency.pools in dagster.yaml): backfill
+    # runs would otherwise write the same __dbt_tmp relations
+    pool="dbt",
 )
-def dbt_gold_assets(context, dbt: DbtCliResource):
-    yield from dbt.cli(
-        ["build", "--select", "gold"],
-        context=context,
-    ).stream()
\ No newline at end of file
+def dbt_gold_assets(context):
+    dbt = context.resources.dbt
+
+    args = ["build", *dbt.run_args()]
+
+    # only the models downstream of the ODS tables loaded in this run
+    # (dagster_code/dbt_selection.py)
+    excluded = unchanged_models(context, manifest)
+
+    # a past day must not overwrite the current dims
+    if not is_today(partition_date(context)):
+        excluded = sorted(
+            set(excluded or []) | set(current_state_models(manifest, dbt.materializations))
+        )
+
+    if excluded is not None:
+        selected = {key.path[-1] for key in context.selected_asset_keys}
+        if selected <= set(excluded):
+            context.log.info("Nothing to build for the selected models in this run")
+            return
+
+        context.log.info(f"Building {sorted(selected - set(excluded))}")
+        if excluded:
+            args += ["--exclude", " ".join(excluded)]
+
+    # the latest_snapshot() macro reads this partition's ODS snapshot
+    with environment({INGESTION_DATE_ENV: context.partition_key}):
+        invocation = dbt.cli(args, context=context, raise_on_error=False)
+    yield from invocation.stream()
+
+    # per-model timings from run_results.json, failed builds included
+    yield from model_stats(context, context.resources.trino, invocation, manifest)
+
+    if not invocation.is_successful():
+        raise invocation.get_error()
@@ -0,0 +1,61 @@
+import time
+from typing import Optional
+
+from dagster import Config, asset
+
+from dagster_code.assets.silver.ods.load import OdsLoadConfig, load_ods
+from dagster_code.partitions import daily_partitions
+from dagster_code.schemas import SCHEMAS
+from dagster_code.seats import CONCENTRATION, SIMULATIONS, seat_projection as project
+
+
+class SeatProjectionConfig(Config):
+    simulations: int = SIMULATIONS
+    concentration: float = CONCENTRATION
+    # fixed seed for reproducible projections
+    seed: Optional[int] = None
+    # how the projection is written to its table, as for the ods_* assets
+    load: OdsLoadConfig = OdsLoadConfig()
+
+
+@asset(
+    required_resource_keys={"trino", "s3"},
+    group_name="gold",
+    partitions_def=daily_partitions,
+)
+def seat_projection(context, config: SeatProjectionConfig, cleaned_stats_cons, cleaned_stats_party):
+    """
+    Seats per party of the latest snapshot: constituency leads, party-list
+    seats by largest remainder, and the Monte Carlo projection over the
+    uncounted share (dagster_code/seats.py).
+    """
+    if cleaned_stats_cons.empty or cleaned_stats_party.empty:
+        return "0 rows inserted"
+
+    started = time.monotonic()
+
+    df = project(
+        cleaned_stats_cons,
+        cleaned_stats_party,
+        simulations=config.simulations,
+        concentration=config.concentration,
+        seed=config.seed,
+    )
+
+    seconds = round(time.monotonic() - started, 3)
+    context.log.info(f"Allocated seats and ran {config.simulations} simulations in {seconds}s")
+
+    snapshot = cleaned_stats_party.iloc[0]
+    df = df.assign(
+        simulations=config.simulations,
+        percent_count=snapshot["percent_count"],
+        ingestion_date=snapshot["ingestion_date"],
+        batch_id=snapshot["batch_id"],
+        snapshot_ts=snapshot["snapshot_ts"],
+    )
+
+    context.add_output_metadata({"simulation_seconds": seconds})
+
+    stats = load_ods(context, config.load, SCHEMAS["seat_projection"], df)
+
+    return f"{stats['rows']} rows inserted"
@@ -0,0 +1,73 @@
+from typing import Dict, List
+
+from dagster import Config, asset
+
+from dagster_code.iceberg_maintenance import (
+    RETENTION,
+    TABLE_RETENTION,
+    TARGET_FILE_SIZE,
+    list_tables,
+    maintain_table,
+)
+
+
+class IcebergMaintenanceConfig(Config):
+    target_file_size: str = TARGET_FILE_SIZE
+    retention: str = RETENTION
+    # schema.table -> retention, on top of TABLE_RETENTION
+    table_retention: Dict[str, str] = {}
+    # schema.table to maintain, every silver and gold table when empty
+    tables: List[str] = []
+
+
+@asset(
+    required_resource_keys={"trino"},
+    group_name="maintenance",
+)
+def iceberg_maintenance(context, config: IcebergMaintenanceConfig):
+    """
+    Compacts the silver and gold Iceberg tables, expires old snapshots and
+    removes orphan files (see dagster_code/iceberg_maintenance.py).
+    """
+    retentions = {**TABLE_RETENTION, **config.table_retention}
+    session_properties = {"iceberg.target_max_file_size": config.target_file_size}
+
+    with context.resources.trino.session(session_properties) as trino:
+        tables = config.tables or list_tables(trino)
+
+        results = []
+        for table in tables:
+            result = maintain_table(
+                trino,
+                table,
+                target_file_size=config.target_file_size,
+                retention=retentions.get(table, config.retention),
+            )
+            context.log.info(
+                f"{table}: {result['files_before']} -> {result['files_after']} files, "
+                f"avg {result['avg_file_bytes_before']} -> {result['avg_file_bytes_after']} bytes, "
+                f"{result['snapshots_before']} -> {result['snapshots_after']} snapshots "
+                f"in {result['seconds']}s"
+            )
+            results.append(result)
+
+        summary = trino.summary()
+
+    files_before = sum(r["files_before"] for r in results)
+    files_after = sum(r["files_after"] for r in results)
+    bytes_before = sum(r["total_bytes_before"] for r in results)
+    bytes_after = sum(r["total_bytes_after"] for r in results)
+
+    context.add_output_metadata({
+        "tables": len(results),
+        "files_before": files_before,
+        "files_after": files_after,
+        "avg_file_bytes_before": bytes_before // files_before if files_before else 0,
+        "avg_file_bytes_after": bytes_after // files_after if files_after else 0,
+        "snapshots_before": sum(r["snapshots_before"] for r in results),
+        "snapshots_after": sum(r["snapshots_after"] for r in results),
+        "table_stats": results,
+        **summary,
+    })
+
+    return f"{len(results)} tables maintained, {files_before} -> {files_after} files"
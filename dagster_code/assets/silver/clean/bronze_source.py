@@ -0,0 +1,37 @@
+from typing import Optional
+
+from dagster import Config
+
+from dagster_code.bronze_store import resolve_bronze_key
+
+
+BRONZE_SOURCE_MODES = ("input", "latest", "batch")
+
+
+class BronzeSourceConfig(Config):
+    # input  - read exactly the key written by the upstream raw_* asset
+    # latest - reprocess the newest snapshot in the bronze manifest
+    # batch  - reprocess the snapshot written by batch_id
+    mode: str = "input"
+    batch_id: Optional[str] = None
+
+
+def bronze_source_key(s3, dataset, file_key, config):
+    """
+    Bronze key a cleaned_* asset should read for the given config.
+    """
+    if config.mode not in BRONZE_SOURCE_MODES:
+        raise Exception(f"Unknown bronze source mode: {config.mode}")
+
+    if config.mode == "latest":
+        return resolve_bronze_key(s3, dataset)
+
+    if config.mode == "batch":
+        if not config.batch_id:
+            raise Exception("batch_id is required when mode is 'batch'")
+        return resolve_bronze_key(s3, dataset, batch_id=config.batch_id)
+
+    if not file_key:
+        raise Exception(f"No bronze {dataset} key passed from raw_{dataset}")
+
+    return file_key
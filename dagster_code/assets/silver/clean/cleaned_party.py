@@ -1,74 +1,37 @@
-import json
 import pandas as pd
 from dagster import asset
-from datetime import datetime
 
-BUCKET = "thailand-election2026"
-BRONZE_PREFIX = "bronze/election_api/party/"
+from dagster_code.assets.silver.clean.bronze_source import BronzeSourceConfig, bronze_source_key
+from dagster_code.bronze_store import read_bronze
+from dagster_code.partitions import daily_partitions, partition_date
+from dagster_code.schemas import SCHEMAS
 
 
 @asset(
     required_resource_keys={"s3"},
     group_name="silver",
+    partitions_def=daily_partitions,
+    io_manager_key="parquet_io_manager",
+    metadata={"dataset": "party"},
 )
-def cleaned_party(context, raw_party):
+def cleaned_party(context, config: BronzeSourceConfig, raw_party):
 
     s3 = context.resources.s3
 
-    # Read latest bronze file
-    paginator = s3.get_paginator("list_objects_v2")
-    pages = paginator.paginate(Bucket=BUCKET, Prefix=BRONZE_PREFIX)
+    # Read the bronze file written by raw_party
+    file_key = bronze_source_key(s3, "party", raw_party, config)
+    context.log.info(f"Reading bronze file: {file_key}")
 
-    keys = [
-        obj["Key"]
-        for page in pages
-        for obj in page.get("Contents", [])
-        if obj["Key"].endswith(".json")
-    ]
+    data = read_bronze(s3, file_key)
 
-    if not keys:
-        raise Exception("No bronze party files found")
-
-    latest_key = sorted(keys)[-1]
-    context.log.info(f"Reading bronze file: {latest_key}")
-
-    obj = s3.get_object(Bucket=BUCKET, Key=latest_key)
-    data = json.loads(obj["Body"].read())
-
-    df = pd.DataFrame(data.get("payload", []))
+    # Transform (declared in dagster_code/schemas.py)
+    ingestion_date = partition_date(context)
+    df = SCHEMAS["party"].transform(data.get("payload"), ingestion_date)
 
     if df.empty:
         context.log.info("No rows found in payload")
         return pd.DataFrame()
 
-    # Transform
-    df = df.rename(columns={
-        "id": "party_id",
-        "name": "party_name",
-        "abbr": "party_abbr",
-        "color": "party_color",
-    })
-
-    df["party_id"] = pd.to_numeric(df.get("party_id"), errors="coerce")
-    df["party_no"] = pd.to_numeric(df.get("party_no"), errors="coerce")
-
-    ingestion_date = datetime.utcnow().date()
-    df["ingestion_date"] = ingestion_date
-
-    df = df[
-        [
-            "party_id",
-            "party_no",
-            "party_name",
-            "party_abbr",
-            "party_color",
-            "logo_url",
-            "ingestion_date",
-        ]
-    ]
-
-    df = df.where(pd.notnull(df), None)
-
     context.log.info(f"Cleaned {len(df)} rows")
 
-    return df
\ No newline at end of file
+    return df
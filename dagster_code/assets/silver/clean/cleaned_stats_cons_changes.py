@@ -0,0 +1,59 @@
+import pandas as pd
+from dagster import Config, asset
+
+from dagster_code.cdc import detect_changes, read_state
+from dagster_code.partitions import daily_partitions, is_today, partition_date
+from dagster_code.schemas import SCHEMAS
+
+
+class ChangeDetectionConfig(Config):
+    # ignore the state and reload the whole partition, to repair it
+    full_reload: bool = False
+
+
+@asset(
+    required_resource_keys={"s3"},
+    group_name="silver",
+    partitions_def=daily_partitions,
+    io_manager_key="parquet_io_manager",
+    metadata={"dataset": "stats_cons_snapshot"},
+)
+def cleaned_stats_cons_changes(context, config: ChangeDetectionConfig, cleaned_stats_cons):
+    """
+    Rows of the constituencies whose counts changed since the snapshot
+    last loaded into ods_stats_cons for this partition (see
+    dagster_code/cdc.py). On count night most constituencies do not move
+    between two snapshots, so ods_stats_cons only rewrites the few that did.
+
+    Past partitions (backfills, reruns of a bad day) and runs with
+    full_reload reload the whole partition instead: the same snapshot
+    would compare as unchanged and never repair the ODS table.
+    """
+    df = cleaned_stats_cons
+
+    if df.empty:
+        context.log.info("No rows to compare")
+        return pd.DataFrame()
+
+    dataset = SCHEMAS["stats_cons"]
+    ingestion_date = partition_date(context)
+
+    if config.full_reload or not is_today(ingestion_date):
+        previous = None
+    else:
+        previous = read_state(context.resources.s3, dataset, ingestion_date)
+
+    changes, summary = detect_changes(dataset, df, previous)
+
+    if summary["reload"]:
+        context.log.info(f"Reloading all {summary['rows']} rows of the partition")
+    else:
+        context.log.info(
+            f"{summary['new_groups'] + summary['changed_groups']} of {summary['groups']} "
+            f"constituencies changed, {summary['deleted_groups']} removed, "
+            f"{summary['changed_rows']} of {summary['rows']} rows to load"
+        )
+
+    context.add_output_metadata(summary)
+
+    return changes
@@ -0,0 +1,138 @@
+from typing import Dict
+
+from dagster import Config
+
+from dagster_code.cdc import (
+    CHANGE_GROUPS,
+    CHANGE_TYPE,
+    DELETE,
+    RELOAD,
+    advance_state,
+    read_state,
+    write_state,
+)
+from dagster_code.ods_loader import (
+    INITIAL_BATCH_ROWS,
+    MAX_STATEMENT_BYTES,
+    TARGET_BATCH_SECONDS,
+    AdaptiveBatcher,
+    bulk_load,
+    merge_load,
+    replace_conditions,
+    values_load,
+)
+
+
+ODS_LOAD_MODES = ("merge", "bulk", "values")
+
+# Trino session properties per dataset, on top of the trino resource
+# defaults. stats_cons is the only table big enough to benefit from more
+# writers and larger files. Its files are sorted by province_id,
+# constituency_id, and 8MB Parquet row groups (instead of Trino's 128MB)
+# give the min/max statistics a finer grain, so province and
+# constituency filters skip more of each file.
+ODS_SESSION_PROPERTIES = {
+    "stats_cons": {
+        "task_concurrency": "8",
+        "task_min_writer_count": "4",
+        "iceberg.target_max_file_size": "256MB",
+        "iceberg.parquet_writer_block_size": "8MB",
+    },
+}
+ODS_SESSION_PROPERTIES["stats_cons_snapshot"] = ODS_SESSION_PROPERTIES["stats_cons"]
+
+
+class OdsLoadConfig(Config):
+    # merge  - stage the frame as Parquet on MinIO, MERGE INTO on the natural key
+    # bulk   - stage the frame as Parquet on MinIO, DELETE + INSERT INTO ... SELECT
+    # values - DELETE + parameterized INSERT ... VALUES batches
+    mode: str = "merge"
+    # values mode batch sizing
+    initial_batch_rows: int = INITIAL_BATCH_ROWS
+    target_batch_seconds: float = TARGET_BATCH_SECONDS
+    max_statement_bytes: int = MAX_STATEMENT_BYTES
+    # overrides of ODS_SESSION_PROPERTIES for this run
+    session_properties: Dict[str, str] = {}
+
+
+def load_ods(context, config, dataset, df, conditions=None):
+    """
+    Load a cleaned DataFrame into its ODS table in the configured mode and
+    report the load stats and Trino query stats as output metadata.
+    conditions select the rows replaced, the whole partition by default.
+    """
+    if config.mode not in ODS_LOAD_MODES:
+        raise Exception(f"Unknown ODS load mode: {config.mode}")
+
+    session_properties = {
+        **ODS_SESSION_PROPERTIES.get(dataset.name, {}),
+        **config.session_properties,
+    }
+
+    with context.resources.trino.session(session_properties) as trino:
+        stats = run_load(context, config, trino, dataset, df, conditions)
+        stats.update(trino.summary())
+
+    context.add_output_metadata(stats)
+
+    return stats
+
+
+def run_load(context, config, trino, dataset, df, conditions):
+    if config.mode == "merge":
+        stats = merge_load(trino, context.resources.s3, dataset, df, conditions=conditions)
+        context.log.info(
+            f"Merged {stats['rows']} rows via Parquet staging, "
+            f"{stats.get('rows_merged')} rows changed in {stats['seconds']}s"
+        )
+    elif config.mode == "bulk":
+        stats = bulk_load(trino, context.resources.s3, dataset, df, conditions=conditions)
+        context.log.info(f"Inserted {stats['rows']} rows via Parquet staging in {stats['seconds']}s")
+    else:
+        batcher = AdaptiveBatcher(
+            initial_rows=config.initial_batch_rows,
+            target_seconds=config.target_batch_seconds,
+            max_statement_bytes=config.max_statement_bytes,
+        )
+        stats = values_load(
+            trino, dataset, df, batcher=batcher, log=context.log.info, conditions=conditions
+        )
+        context.log.info(
+            f"Inserted {stats['rows']} rows in {stats['statements']} statements "
+            f"({stats['rows_per_sec']} rows/sec)"
+        )
+
+    return stats
+
+
+def load_changes(context, config, dataset, changes):
+    """
+    Apply the output of a change detection asset (dagster_code/cdc.py):
+    replace the rows of the changed groups only, or the whole partition
+    on a reload, then advance the change detection state.
+    """
+    s3 = context.resources.s3
+    column = CHANGE_GROUPS[dataset.name]
+    ingestion_date = changes["ingestion_date"].iloc[0]
+
+    if (changes[CHANGE_TYPE] == RELOAD).any():
+        conditions = None
+    else:
+        conditions = {
+            **replace_conditions(dataset, changes),
+            column: list(changes[column].unique()),
+        }
+
+    previous = read_state(s3, dataset, ingestion_date)
+
+    stats = load_ods(
+        context,
+        config,
+        dataset,
+        changes[changes[CHANGE_TYPE] != DELETE],
+        conditions=conditions,
+    )
+
+    write_state(s3, dataset, ingestion_date, advance_state(dataset, previous, changes))
+
+    return stats
@@ -1,67 +1,22 @@
 from dagster import asset
 
-BATCH_SIZE = 1000
-
-
-def sql_val(v):
-    if v is None:
-        return "NULL"
-    if isinstance(v, str):
-        return "'" + v.replace("'", "''") + "'"
-    return str(v)
+from dagster_code.assets.silver.ods.load import OdsLoadConfig, load_ods
+from dagster_code.partitions import daily_partitions
+from dagster_code.schemas import SCHEMAS
 
 
 @asset(
-    required_resource_keys={"trino"},
+    required_resource_keys={"trino", "s3"},
     group_name="silver",
+    partitions_def=daily_partitions,
 )
-def ods_mp_candidate(context, cleaned_mp_candidate):
+def ods_mp_candidate(context, config: OdsLoadConfig, cleaned_mp_candidate):
 
     df = cleaned_mp_candidate
 
     if df.empty:
         return "0 rows inserted"
 
-    trino = context.resources.trino
-    cursor = trino.cursor()
-
-    rows = list(df.itertuples(index=False, name=None))
-    ingestion_date = df["ingestion_date"].iloc[0]
-
-    try:
-        # Idempotent delete
-        cursor.execute(f"""
-            DELETE FROM iceberg.silver.ods_mp_candidate
-            WHERE ingestion_date = DATE '{ingestion_date}'
-        """)
-
-        # Batch insert
-        for i in range(0, len(rows), BATCH_SIZE):
-            batch = rows[i:i+BATCH_SIZE]
-
-            values_sql = ", ".join(
-                [
-                    "(" +
-                    ", ".join(
-                        sql_val(v) if idx != 5 else f"DATE '{v}'"
-                        for idx, v in enumerate(row)
-                    ) +
-                    ")"
-                    for row in batch
-                ]
-            )
-
-            sql = f"""
-                INSERT INTO iceberg.silver.ods_mp_candidate
-                VALUES {values_sql}
-            """
-
-            cursor.execute(sql)
-
-        trino.commit()
-        context.log.info(f"Inserted {len(rows)} rows")
-
-    finally:
-        cursor.close()
+    stats = load_ods(context, config, SCHEMAS["mp_candidate"], df)
 
-    return f"{len(rows)} rows inserted"
\ No newline at end of file
+    return f"{stats['rows']} rows inserted"
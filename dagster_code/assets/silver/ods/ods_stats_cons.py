@@ -1,73 +1,22 @@
 from dagster import asset
-import math
 
-BATCH_SIZE = 1000
-
-
-def sql_val(v):
-    if v is None:
-        return "NULL"
-    if isinstance(v, float) and math.isnan(v):
-        return "NULL"
-    if isinstance(v, str):
-        return "'" + v.replace("'", "''") + "'"
-    return str(v)
+from dagster_code.assets.silver.ods.load import OdsLoadConfig, load_changes
+from dagster_code.partitions import daily_partitions
+from dagster_code.schemas import SCHEMAS
 
 
 @asset(
-    required_resource_keys={"trino"},
+    required_resource_keys={"trino", "s3"},
     group_name="silver",
+    partitions_def=daily_partitions,
 )
-def ods_stats_cons(context, cleaned_stats_cons):
-
-    df = cleaned_stats_cons
-
-    if df.empty:
-        return "0 rows inserted"
-
-    # Double safety protection against NaN (double safety)
-    df = df.where(df.notnull(), None)
-
-    trino = context.resources.trino
-    cursor = trino.cursor()
-
-    rows = list(df.itertuples(index=False, name=None))
-    ingestion_date = df["ingestion_date"].iloc[0]
-
-    try:
-        # Idempotent delete
-        cursor.execute(f"""
-            DELETE FROM iceberg.silver.ods_stats_cons
-            WHERE ingestion_date = DATE '{ingestion_date}'
-        """)
-
-        # Batch insert
-        for i in range(0, len(rows), BATCH_SIZE):
-            batch = rows[i:i+BATCH_SIZE]
-
-            values_sql = ", ".join(
-                [
-                    "(" +
-                    ", ".join(
-                        sql_val(v) if idx != 11 else f"DATE '{v}'"
-                        for idx, v in enumerate(row)
-                    ) +
-                    ")"
-                    for row in batch
-                ]
-            )
-
-            sql = f"""
-                INSERT INTO iceberg.silver.ods_stats_cons
-                VALUES {values_sql}
-            """
+def ods_stats_cons(context, config: OdsLoadConfig, cleaned_stats_cons_changes):
 
-            cursor.execute(sql)
+    changes = cleaned_stats_cons_changes
 
-        trino.commit()
-        context.log.info(f"Inserted {len(rows)} rows")
+    if changes.empty:
+        return "0 rows changed"
 
-    finally:
-        cursor.close()
+    stats = load_changes(context, config, SCHEMAS["stats_cons"], changes)
 
-    return f"{len(rows)} rows inserted"
\ No newline at end of file
+    return f"{stats['rows']} rows inserted"
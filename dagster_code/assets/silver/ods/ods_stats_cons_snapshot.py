@@ -0,0 +1,22 @@
+from dagster import asset
+
+from dagster_code.assets.silver.ods.load import OdsLoadConfig, load_ods
+from dagster_code.partitions import daily_partitions
+from dagster_code.schemas import SCHEMAS
+
+
+@asset(
+    required_resource_keys={"trino", "s3"},
+    group_name="silver",
+    partitions_def=daily_partitions,
+)
+def ods_stats_cons_snapshot(context, config: OdsLoadConfig, cleaned_stats_cons):
+
+    df = cleaned_stats_cons
+
+    if df.empty:
+        return "0 rows inserted"
+
+    stats = load_ods(context, config, SCHEMAS["stats_cons_snapshot"], df)
+
+    return f"{stats['rows']} rows inserted"
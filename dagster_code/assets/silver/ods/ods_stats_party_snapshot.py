@@ -0,0 +1,22 @@
+from dagster import asset
+
+from dagster_code.assets.silver.ods.load import OdsLoadConfig, load_ods
+from dagster_code.partitions import daily_partitions
+from dagster_code.schemas import SCHEMAS
+
+
+@asset(
+    required_resource_keys={"trino", "s3"},
+    group_name="silver",
+    partitions_def=daily_partitions,
+)
+def ods_stats_party_snapshot(context, config: OdsLoadConfig, cleaned_stats_party):
+
+    df = cleaned_stats_party
+
+    if df.empty:
+        return "0 rows inserted"
+
+    stats = load_ods(context, config, SCHEMAS["stats_party_snapshot"], df)
+
+    return f"{stats['rows']} rows inserted"
@@ -0,0 +1,301 @@
+import gzip
+import json
+import re
+import uuid
+from datetime import datetime
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+
+BUCKET_NAME = "thailand-election2026"
+BRONZE_ROOT = "bronze/election_api"
+
+# Small pointer objects per dataset, kept outside the dataset prefixes so
+# they never show up in bronze listings:
+#   _manifest/<dataset>/latest.json            newest snapshot
+#   _manifest/<dataset>/batch_id=<id>.json     one per written snapshot
+#   _manifest/<dataset>/date=<date>.json       snapshot a partition loaded,
+#                                              written or reused
+MANIFEST_ROOT = f"{BRONZE_ROOT}/_manifest"
+
+BRONZE_FILE_RE = re.compile(
+    r"ingestion_date=(?P<date>[^/]+)/(?P<ts>\d{8}T\d{6})_(?P<batch_id>[^/.]+)\.json(\.gz)?$"
+)
+
+# Payloads are uploaded gzip-compressed, multipart above 8MB.
+BRONZE_SUFFIX = ".json.gz"
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+)
+
+
+def new_batch_id():
+    return str(uuid.uuid4())[:8]
+
+
+def bronze_prefix(dataset):
+    return f"{BRONZE_ROOT}/{dataset}/"
+
+
+def bronze_key(dataset, ingested_at, batch_id):
+    ingestion_date = ingested_at.strftime("%Y-%m-%d")
+    timestamp_str = ingested_at.strftime("%Y%m%dT%H%M%S")
+
+    return (
+        f"{bronze_prefix(dataset)}"
+        f"ingestion_date={ingestion_date}/"
+        f"{timestamp_str}_{batch_id}{BRONZE_SUFFIX}"
+    )
+
+
+def key_date(file_key):
+    """
+    ingestion_date (YYYY-MM-DD) encoded in a bronze key.
+    """
+    match = BRONZE_FILE_RE.search(file_key)
+    return match.group("date") if match else None
+
+
+def snapshot_of(file_key):
+    """
+    batch_id and ingestion timestamp (UTC, naive) encoded in a bronze key.
+    """
+    match = BRONZE_FILE_RE.search(file_key)
+    if not match:
+        raise Exception(f"Not a bronze snapshot key: {file_key}")
+
+    return {
+        "batch_id": match.group("batch_id"),
+        "snapshot_ts": datetime.strptime(match.group("ts"), "%Y%m%dT%H%M%S"),
+    }
+
+
+def latest_pointer_key(dataset):
+    return f"{MANIFEST_ROOT}/{dataset}/latest.json"
+
+
+def batch_pointer_key(dataset, batch_id):
+    return f"{MANIFEST_ROOT}/{dataset}/batch_id={batch_id}.json"
+
+
+def date_pointer_key(dataset, ingestion_date):
+    return f"{MANIFEST_ROOT}/{dataset}/date={ingestion_date}.json"
+
+
+def is_missing(error):
+    return error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404")
+
+
+def get_json(s3, key):
+    """
+    GET a JSON object, None if it does not exist.
+    """
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if is_missing(e):
+            return None
+        raise
+
+    return json.loads(obj["Body"].read())
+
+
+def put_json(s3, key, value):
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=key,
+        Body=json.dumps(value),
+        ContentType="application/json",
+    )
+
+
+def write_bronze(s3, result, batch_id):
+    """
+    Upload the gzip spool of a FetchResult as-is and point the dataset
+    manifest at it. The metadata envelope travels as S3 object metadata
+    (and in the manifest entry), so the payload is never re-serialized.
+    Returns the manifest entry of the written object.
+    """
+    metadata = {
+        "dataset": result.dataset,
+        "ingestion_timestamp": result.fetched_at.isoformat() + "Z",
+        "source": result.url,
+        "status_code": str(result.status_code),
+        "batch_id": batch_id,
+    }
+
+    file_key = bronze_key(result.dataset, result.fetched_at, batch_id)
+
+    s3.upload_fileobj(
+        result.body,
+        BUCKET_NAME,
+        file_key,
+        ExtraArgs={
+            "ContentType": "application/json",
+            "ContentEncoding": "gzip",
+            "Metadata": metadata,
+        },
+        Config=TRANSFER_CONFIG,
+    )
+
+    entry = {
+        "dataset": result.dataset,
+        "key": file_key,
+        "batch_id": batch_id,
+        "size": result.compressed_bytes,
+        "raw_size": result.raw_bytes,
+        "timestamp": metadata["ingestion_timestamp"],
+        "source": result.url,
+        "status_code": result.status_code,
+        "content_hash": result.content_hash,
+        "etag": result.etag,
+        "last_modified": result.last_modified,
+    }
+
+    write_manifest_entry(s3, entry)
+
+    return entry
+
+
+def write_manifest_entry(s3, entry):
+    # batch pointer first, latest only once the batch can be resolved
+    put_json(s3, batch_pointer_key(entry["dataset"], entry["batch_id"]), entry)
+    put_json(s3, latest_pointer_key(entry["dataset"]), entry)
+
+
+def read_latest(s3, dataset):
+    """
+    Manifest entry of the newest snapshot, {} if nothing was written yet.
+    """
+    return get_json(s3, latest_pointer_key(dataset)) or {}
+
+
+def rebuild_manifest(s3, dataset):
+    """
+    Fallback for prefixes written before the manifest existed (or a lost
+    pointer): list the whole dataset prefix once and recreate the pointers.
+    Content hash and validators cannot be recovered from a listing, so the
+    next fetch of the dataset always writes a fresh snapshot.
+    Returns the latest entry, None if the prefix is empty.
+    """
+    paginator = s3.get_paginator("list_objects_v2")
+    pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix=bronze_prefix(dataset))
+
+    entries = []
+    for page in pages:
+        for obj in page.get("Contents", []):
+            match = BRONZE_FILE_RE.search(obj["Key"])
+            if not match:
+                continue
+
+            ts = match.group("ts")
+            entries.append({
+                "dataset": dataset,
+                "key": obj["Key"],
+                "batch_id": match.group("batch_id"),
+                "size": obj.get("Size"),
+                "timestamp": f"{ts[:4]}-{ts[4:6]}-{ts[6:8]}T{ts[9:11]}:{ts[11:13]}:{ts[13:15]}Z",
+                "content_hash": None,
+                "etag": None,
+                "last_modified": None,
+            })
+
+    if not entries:
+        return None
+
+    entries.sort(key=lambda e: e["key"])
+
+    for entry in entries:
+        put_json(s3, batch_pointer_key(dataset, entry["batch_id"]), entry)
+    put_json(s3, latest_pointer_key(dataset), entries[-1])
+
+    return entries[-1]
+
+
+def resolve_bronze_key(s3, dataset, batch_id=None):
+    """
+    Bronze key of the newest snapshot, or of a given batch, with a single GET.
+    Falls back to rebuilding the manifest from a listing when the pointer
+    is missing.
+    """
+    if batch_id:
+        entry = get_json(s3, batch_pointer_key(dataset, batch_id))
+    else:
+        entry = get_json(s3, latest_pointer_key(dataset))
+
+    if entry is None:
+        latest = rebuild_manifest(s3, dataset)
+        if latest is None:
+            raise Exception(f"No bronze {dataset} files found")
+
+        entry = latest if not batch_id else get_json(s3, batch_pointer_key(dataset, batch_id))
+        if entry is None:
+            raise Exception(f"No bronze {dataset} file found for batch_id={batch_id}")
+
+    return entry["key"]
+
+
+def write_date_pointer(s3, ingestion_date, entry):
+    """
+    Record the snapshot loaded for an ingestion_date partition. Unchanged
+    endpoints reuse an older snapshot and write nothing under the date
+    itself, the pointer is what a replay of the day finds.
+    """
+    put_json(s3, date_pointer_key(entry["dataset"], ingestion_date), entry)
+
+
+def key_for_date(s3, dataset, ingestion_date):
+    """
+    Bronze key the ingestion_date partition loaded, None if there is no
+    snapshot on or before that day. Days without a date pointer (loaded
+    before the pointers existed) fall back to the newest snapshot on or
+    before the day, from a listing of the dataset prefix.
+    """
+    day = f"{ingestion_date:%Y-%m-%d}"
+
+    entry = get_json(s3, date_pointer_key(dataset, day))
+    if entry is not None:
+        return entry["key"]
+
+    paginator = s3.get_paginator("list_objects_v2")
+    pages = paginator.paginate(Bucket=BUCKET_NAME, Prefix=bronze_prefix(dataset))
+
+    keys = [
+        obj["Key"]
+        for page in pages
+        for obj in page.get("Contents", [])
+        if BRONZE_FILE_RE.search(obj["Key"]) and key_date(obj["Key"]) <= day
+    ]
+
+    # keys sort by ingestion_date, then timestamp
+    return max(keys) if keys else None
+
+
+def read_bronze(s3, file_key):
+    """
+    Read a bronze object as {"metadata": ..., "payload": ...}.
+    Handles both the gzip payload + object metadata layout and the older
+    uncompressed .json envelope.
+    """
+    obj = s3.get_object(Bucket=BUCKET_NAME, Key=file_key)
+
+    if not file_key.endswith(".gz"):
+        return json.loads(obj["Body"].read())
+
+    with gzip.GzipFile(fileobj=obj["Body"]) as gz:
+        payload = json.load(gz)
+
+    return {"metadata": obj.get("Metadata", {}), "payload": payload}
+
+
+def is_unchanged(result, latest):
+    """
+    True when the endpoint answered 304 or returned the same bytes as the
+    latest snapshot in the manifest.
+    """
+    if result.not_modified:
+        return True
+
+    return bool(latest) and result.content_hash == latest.get("content_hash")
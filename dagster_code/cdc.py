@@ -0,0 +1,169 @@
+"""
+Change detection between consecutive snapshots of a dataset.
+
+Rows are hashed and the row hashes summed per group, the unit a source
+update touches (a constituency for stats_cons). The group hashes are
+compared with those of the previous snapshot loaded into the same ODS
+partition, kept as one small Parquet object per partition:
+
+    silver/_cdc/<dataset>/ingestion_date=<date>.parquet    (group, hash)
+
+Only the ODS asset advances the state, once the changes are committed,
+so a failed load is simply detected again by the next run.
+"""
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+from dagster_code.bronze_store import BUCKET_NAME, is_missing
+
+
+CDC_ROOT = "silver/_cdc"
+
+# dataset -> column grouping the rows that change together
+CHANGE_GROUPS = {
+    "stats_cons": "constituency_id",
+}
+
+# reload - no state for the partition yet, replace it with these rows
+# upsert - the group is new or changed, replace its rows
+# delete - the group is gone, only the group column is set
+CHANGE_TYPE = "change_type"
+RELOAD = "reload"
+UPSERT = "upsert"
+DELETE = "delete"
+
+GROUP_HASH = "group_hash"
+
+
+def state_key(dataset, ingestion_date):
+    return f"{CDC_ROOT}/{dataset.name}/ingestion_date={ingestion_date}.parquet"
+
+
+def read_state(s3, dataset, ingestion_date):
+    """
+    {group: hash} of the snapshot last loaded into the partition, None if
+    nothing was loaded through change detection yet.
+    """
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=state_key(dataset, ingestion_date))
+    except ClientError as e:
+        if is_missing(e):
+            return None
+        raise
+
+    table = pq.read_table(io.BytesIO(obj["Body"].read()))
+    return dict(zip(table.column("group").to_pylist(), table.column("hash").to_pylist()))
+
+
+def write_state(s3, dataset, ingestion_date, state):
+    table = pa.table({
+        "group": pa.array(list(state.keys()), type=pa.string()),
+        "hash": pa.array(list(state.values()), type=pa.uint64()),
+    })
+
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=state_key(dataset, ingestion_date),
+        Body=buffer.getvalue(),
+    )
+
+
+def row_hashes(dataset, df):
+    # every table column but ingestion_date, which differs between days
+    columns = [name for name in dataset.column_names if name != "ingestion_date"]
+    return pd.util.hash_pandas_object(df[columns], index=False)
+
+
+def group_hashes(dataset, df):
+    """
+    Hash per group: row hashes summed modulo 2**64, so row order does
+    not matter.
+    """
+    column = CHANGE_GROUPS[dataset.name]
+
+    if df[column].isna().any():
+        raise Exception(f"{dataset.name}: NULL {column}, cannot detect changes")
+
+    return row_hashes(dataset, df).groupby(df[column].to_numpy()).sum()
+
+
+def detect_changes(dataset, df, previous):
+    """
+    Rows of df whose group is new or changed since previous ({group: hash}
+    or None), tagged with change_type and group_hash, plus one delete row
+    per group that disappeared.
+    Returns (changes, summary).
+    """
+    column = CHANGE_GROUPS[dataset.name]
+    current = group_hashes(dataset, df)
+    # nullable, so the delete rows do not turn the hashes into floats
+    hashes = df[column].map(current).astype("UInt64")
+
+    if previous is None:
+        changes = df.assign(**{CHANGE_TYPE: RELOAD, GROUP_HASH: hashes})
+
+        summary = {
+            "reload": True,
+            "rows": len(df),
+            "groups": len(current),
+            "changed_rows": len(changes),
+        }
+        return changes, summary
+
+    changed = [
+        group
+        for group, value in current.items()
+        if previous.get(group) != value
+    ]
+    deleted = sorted(set(previous) - set(current.index))
+
+    # assigned before filtering, an empty frame would adopt the index of hashes
+    upserts = df.assign(**{CHANGE_TYPE: UPSERT, GROUP_HASH: hashes})[df[column].isin(changed)]
+
+    deletes = pd.DataFrame({
+        column: deleted,
+        "ingestion_date": df["ingestion_date"].iloc[0],
+        CHANGE_TYPE: DELETE,
+        GROUP_HASH: pd.array([None] * len(deleted), dtype="UInt64"),
+    })
+
+    changes = pd.concat([upserts, deletes], ignore_index=True) if deleted else upserts
+
+    new_groups = sum(1 for group in changed if group not in previous)
+
+    summary = {
+        "reload": False,
+        "rows": len(df),
+        "groups": len(current),
+        "new_groups": new_groups,
+        "changed_groups": len(changed) - new_groups,
+        "deleted_groups": len(deleted),
+        "unchanged_groups": len(current) - len(changed),
+        "changed_rows": len(upserts),
+    }
+    return changes, summary
+
+
+def advance_state(dataset, previous, changes):
+    """
+    State after changes were applied on top of previous.
+    """
+    column = CHANGE_GROUPS[dataset.name]
+    reload = (changes[CHANGE_TYPE] == RELOAD).any()
+
+    state = {} if reload or previous is None else dict(previous)
+
+    for group in changes.loc[changes[CHANGE_TYPE] == DELETE, column]:
+        state.pop(group, None)
+
+    loaded = changes[changes[CHANGE_TYPE] != DELETE]
+    state.update(zip(loaded[column], loaded[GROUP_HASH].astype("uint64").tolist()))
+
+    return state
@@ -0,0 +1,136 @@
+"""
+Run settings and per-model stats of the dbt gold build.
+
+The dbt resource hands assets a DbtResource: the DbtCliResource of the
+project plus the thread count and the per-model materialization
+overrides of the resource config, passed to dbt as --threads and the
+materializations var (macros/materialization.sql). Values that change
+from run to run, like the partition's ingestion date, go to dbt as env
+vars instead (environment()): different --vars on every build would make
+dbt reparse the whole project each time (dagster_code/dbt_manifest.py).
+
+After a build, model_stats() reads its run_results.json: dbt's execution
+time and the rows affected of every model, and what Trino read and wrote
+for the model's main statement (TrinoClient.query_info).
+"""
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+import requests
+from dagster import AssetObservation
+from dagster_dbt import DbtCliResource
+from dagster_dbt.asset_utils import default_asset_key_fn
+
+from dagster_code.dbt_manifest import is_current
+
+
+DBT_THREADS = 4
+MATERIALIZATIONS = ("table", "incremental", "view")
+
+# read by the snapshot_date() macro
+INGESTION_DATE_ENV = "DBT_INGESTION_DATE"
+
+# slowest models logged after every build
+SLOWEST_MODELS = 5
+
+
+class DbtResource(DbtCliResource):
+    threads: int = DBT_THREADS
+    # model name -> table, incremental or view
+    materializations: Dict[str, str] = {}
+
+    def run_args(self):
+        """
+        --threads, the materialization overrides as --vars (left out when
+        there are none, to keep the vars of the prepared manifest) and
+        --no-partial-parse when the project changed since the manifest
+        was prepared.
+        """
+        args = ["--threads", str(self.threads)]
+
+        for model, materialized in self.materializations.items():
+            if materialized not in MATERIALIZATIONS:
+                raise Exception(f"{model}: unknown materialization {materialized}")
+
+        if self.materializations:
+            args += ["--vars", json.dumps({"materializations": self.materializations})]
+
+        if not is_current(Path(self.project_dir)):
+            args.append("--no-partial-parse")
+
+        return args
+
+
+@contextmanager
+def environment(variables):
+    """
+    os.environ plus variables, for the dbt process started inside (dbt.cli
+    passes on a copy of the environment).
+    """
+    previous = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def model_results(run_results, manifest):
+    """
+    (model node, stats) of every model in run_results.json.
+    """
+    for result in run_results["results"]:
+        node = manifest["nodes"].get(result["unique_id"])
+        if node is None or node["resource_type"] != "model":
+            continue
+
+        adapter_response = result.get("adapter_response") or {}
+
+        yield node, {
+            "dbt_status": result["status"],
+            "dbt_execution_seconds": round(result["execution_time"], 3),
+            "dbt_rows_affected": adapter_response.get("rows_affected"),
+            "trino_query_id": adapter_response.get("query_id"),
+        }
+
+
+def model_stats(context, trino, invocation, manifest):
+    """
+    One AssetObservation per model of the build with its stats, and the
+    slowest models in the log.
+    """
+    run_results = invocation.get_artifact("run_results.json")
+    results = list(model_results(run_results, manifest))
+
+    for node, stats in results:
+        query_id = stats.pop("trino_query_id")
+        if query_id:
+            try:
+                info = trino.query_info(query_id)
+            except requests.RequestException as e:
+                context.log.warning(f"No Trino query info for {node['name']} ({query_id}): {e}")
+            else:
+                stats.update({f"trino_{key}": value for key, value in info.items()})
+
+        yield AssetObservation(
+            asset_key=default_asset_key_fn(node),
+            partition=context.partition_key,
+            metadata=stats,
+        )
+
+    slowest = sorted(results, key=lambda result: -result[1]["dbt_execution_seconds"])
+    context.log.info(
+        f"dbt build of {len(results)} models in {run_results['elapsed_time']:.1f}s, slowest: "
+        + ", ".join(
+            f"{node['name']} {stats['dbt_execution_seconds']}s"
+            for node, stats in slowest[:SLOWEST_MODELS]
+        )
+    )
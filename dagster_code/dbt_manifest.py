@@ -0,0 +1,107 @@
+"""
+Precompiled manifest of the dbt project.
+
+The manifest, and dbt's partial parse state next to it, is prepared when
+the user code image is built:
+
+    python -m dagster_code.dbt_manifest
+
+together with a hash of the project files it was parsed from
+(target/manifest.hash). The code location loads that manifest, once,
+instead of parsing the project, and only prepares it again when the hash
+no longer matches the files (a bind-mounted project edited in
+development).
+
+dbt builds keep partial parsing, dagster-dbt seeds the target path of
+every invocation with target/partial_parse.msgpack, unless the project
+changed since the manifest was prepared: those builds run with
+--no-partial-parse (DbtResource.run_args).
+"""
+import functools
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from dagster_dbt import DbtCliResource
+
+
+DBT_PROJECT_DIR = Path(os.getenv("DBT_PROJECT_DIR", "/opt/dagster/app/dbt_election"))
+TARGET_PATH = Path("target")
+
+# what dbt parse reads, relative to the project dir
+PROJECT_FILES = ("dbt_project.yml", "packages.yml", "profiles.yml")
+PROJECT_DIRS = ("models", "macros", "seeds", "snapshots", "tests", "analyses")
+
+
+def project_files(project_dir=DBT_PROJECT_DIR):
+    files = [project_dir / name for name in PROJECT_FILES]
+    for directory in PROJECT_DIRS:
+        files.extend((project_dir / directory).rglob("*"))
+
+    return sorted(path for path in files if path.is_file())
+
+
+def project_hash(project_dir=DBT_PROJECT_DIR):
+    digest = hashlib.sha256()
+
+    for path in project_files(project_dir):
+        digest.update(str(path.relative_to(project_dir)).encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def manifest_path(project_dir=DBT_PROJECT_DIR):
+    return project_dir / TARGET_PATH / "manifest.json"
+
+
+def hash_path(project_dir=DBT_PROJECT_DIR):
+    return project_dir / TARGET_PATH / "manifest.hash"
+
+
+def prepared_hash(project_dir=DBT_PROJECT_DIR):
+    """
+    Hash of the files the prepared manifest was parsed from, None when
+    there is no prepared manifest.
+    """
+    path = hash_path(project_dir)
+    if not path.exists() or not manifest_path(project_dir).exists():
+        return None
+    return path.read_text().strip()
+
+
+def is_current(project_dir=DBT_PROJECT_DIR):
+    return prepared_hash(project_dir) == project_hash(project_dir)
+
+
+def prepare_manifest(project_dir=DBT_PROJECT_DIR):
+    """
+    dbt parse the project into target/ unless the manifest there is
+    current. Returns the manifest path.
+    """
+    current = project_hash(project_dir)
+    if prepared_hash(project_dir) == current:
+        return manifest_path(project_dir)
+
+    dbt = DbtCliResource(project_dir=os.fspath(project_dir))
+    dbt.cli(["parse", "--no-partial-parse"], target_path=TARGET_PATH).wait()
+
+    hash_path(project_dir).write_text(current)
+    return manifest_path(project_dir)
+
+
+@functools.cache
+def load_manifest():
+    """
+    The manifest of DBT_PROJECT_DIR, prepared first if it is stale.
+    """
+    return json.loads(prepare_manifest().read_text())
+
+
+if __name__ == "__main__":
+    started = time.monotonic()
+    path = prepare_manifest()
+    print(f"{path} ({hash_path().read_text()}) ready in {time.monotonic() - started:.1f}s")
@@ -0,0 +1,116 @@
+"""
+Changed-sources selection for the dbt gold build.
+
+The dbt sources are the ODS assets (meta.dagster.asset_key in
+models/gold/source.yml), so in the asset graph the gold models depend on
+the ODS loads. When a run also loads ODS tables, the dbt step builds only
+the selected models downstream of a source that got new data in that
+run. On count night a stats_party snapshot then rebuilds the two
+stats_party facts instead of every dimension and fact.
+
+A source changed when its ODS asset materialized in this run with load
+stats (the assets skip the load, and its metadata, when there is nothing
+to load). A source whose ODS asset is not part of the run did not change.
+When none of them is, e.g. a dbt-only run from the UI, nothing is
+excluded.
+
+Models rebuilt whole from the partition's snapshot (table and view
+materializations, the dims) hold the current state, not one set of rows
+per ingestion_date. Runs of a past partition leave them out, otherwise a
+backfill would overwrite the current dims with an old day.
+"""
+from dagster import AssetRecordsFilter
+from dagster_dbt.asset_utils import default_asset_key_fn
+
+
+def source_assets(manifest):
+    """
+    dbt source unique_id -> AssetKey of the asset loading the source.
+    """
+    return {
+        unique_id: default_asset_key_fn(source)
+        for unique_id, source in manifest["sources"].items()
+    }
+
+
+def run_asset_keys(context):
+    """
+    Asset keys the current run materializes.
+    """
+    return context.run.asset_selection or set(context.job_def.asset_layer.executable_asset_keys)
+
+
+def loaded_in_run(context, asset_key):
+    """
+    True when the asset loaded data into its table in this run, for the
+    partition of the run.
+    """
+    result = context.instance.fetch_materializations(
+        AssetRecordsFilter(asset_key=asset_key, asset_partitions=[context.partition_key]),
+        limit=1,
+    )
+    return any(
+        record.run_id == context.run_id and "rows" in record.asset_materialization.metadata
+        for record in result.records
+    )
+
+
+def downstream_models(manifest, unique_ids):
+    """
+    Names of the models downstream of the given nodes, through ephemeral
+    models too.
+    """
+    seen = set()
+    queue = list(unique_ids)
+
+    while queue:
+        for child in manifest["child_map"].get(queue.pop(), []):
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+
+    return {
+        manifest["nodes"][unique_id]["name"]
+        for unique_id in seen
+        if unique_id.startswith("model.")
+    }
+
+
+def unchanged_models(context, manifest):
+    """
+    Names of the models no changed source feeds into, to exclude from the
+    build. None when the run loads none of the sources.
+    """
+    sources = source_assets(manifest)
+    planned = run_asset_keys(context)
+
+    if not any(key in planned for key in sources.values()):
+        return None
+
+    changed = [
+        unique_id
+        for unique_id, key in sources.items()
+        if key in planned and loaded_in_run(context, key)
+    ]
+    rebuilt = downstream_models(manifest, changed)
+
+    return sorted(
+        node["name"]
+        for node in manifest["nodes"].values()
+        if node["resource_type"] == "model"
+        and node["config"]["materialized"] != "ephemeral"
+        and node["name"] not in rebuilt
+    )
+
+
+def current_state_models(manifest, materializations):
+    """
+    Names of the table and view models, with the materialization
+    overrides of the dbt resource applied.
+    """
+    return sorted(
+        node["name"]
+        for node in manifest["nodes"].values()
+        if node["resource_type"] == "model"
+        and materializations.get(node["name"], node["config"]["materialized"]) in ("table", "view")
+    )
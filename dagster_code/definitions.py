@@ -1,30 +1,49 @@
-from dagster import Definitions, load_assets_from_package_module, define_asset_job, AssetSelection, ScheduleDefinition
+from dagster import Definitions, load_assets_from_package_module, define_asset_job, AssetSelection, build_schedule_from_partitioned_job, ScheduleDefinition
 import dagster_code.assets as assets
-from dagster_code.resources import s3, trino_resource, dbt
+from dagster_code.live_count import live_count_job, live_count_sensor
+from dagster_code.resources import s3, trino_resource, dbt, parquet_io_manager
 
 
 all_assets = load_assets_from_package_module(assets)
 
 
+# bronze runs in the same partitioned run: cleaned_* read the exact raw_*
+# key materialized for their partition
 full_pipeline_job = define_asset_job(
     name="full_pipeline_job",
-    selection=AssetSelection.groups("silver") | AssetSelection.groups("default"),
+    selection=AssetSelection.groups("bronze", "silver", "gold") | AssetSelection.groups("default"),
 )
 
 
-daily_full_schedule = ScheduleDefinition(
-    job=full_pipeline_job,
-    cron_schedule="0 2 * * *",  
+# runs today's partition at 02:00, past days are backfilled from the UI
+daily_full_schedule = build_schedule_from_partitioned_job(
+    full_pipeline_job,
+    hour_of_day=2,
+)
+
+
+iceberg_maintenance_job = define_asset_job(
+    name="iceberg_maintenance_job",
+    selection=AssetSelection.groups("maintenance"),
+)
+
+
+# after the daily run, compacts what it wrote
+iceberg_maintenance_schedule = ScheduleDefinition(
+    job=iceberg_maintenance_job,
+    cron_schedule="0 4 * * *",
 )
 
 
 defs = Definitions(
     assets=all_assets,
-    jobs=[full_pipeline_job],
-    schedules=[daily_full_schedule],
+    jobs=[full_pipeline_job, live_count_job, iceberg_maintenance_job],
+    schedules=[daily_full_schedule, iceberg_maintenance_schedule],
+    sensors=[live_count_sensor],
     resources={
         "s3": s3,
         "trino": trino_resource,
         "dbt": dbt,
+        "parquet_io_manager": parquet_io_manager,
     },
 )
\ No newline at end of file
@@ -0,0 +1,246 @@
+import gzip
+import hashlib
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+STATIC_BASE_URL = "https://static-ectreport69.ect.go.th/data/data/refs"
+STATS_BASE_URL = "https://stats-ectreport69.ect.go.th/data/records"
+
+ENDPOINTS = {
+    "province": f"{STATIC_BASE_URL}/info_province.json",
+    "constituency": f"{STATIC_BASE_URL}/info_constituency.json",
+    "party": f"{STATIC_BASE_URL}/info_party_overview.json",
+    "mp_candidate": f"{STATIC_BASE_URL}/info_mp_candidate.json",
+    "party_candidate": f"{STATIC_BASE_URL}/info_party_candidate.json",
+    "stats_cons": f"{STATS_BASE_URL}/stats_cons.json",
+    "stats_party": f"{STATS_BASE_URL}/stats_party.json",
+}
+
+DEFAULT_TIMEOUT = 30
+
+# stats_cons is by far the largest payload, give it more room
+TIMEOUTS = {
+    "stats_cons": 60,
+}
+
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Response bodies are streamed into a gzip spool, kept in memory up to
+# SPOOL_MAX_BYTES and rolled over to a temp file beyond that.
+CHUNK_SIZE = 1024 * 1024
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+GZIP_LEVEL = 6
+
+
+@dataclass
+class FetchResult:
+    dataset: str
+    url: str
+    status_code: int
+    body: object
+    fetched_at: datetime
+    elapsed_seconds: float
+    attempts: int
+    etag: str = None
+    last_modified: str = None
+    content_hash: str = None
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+
+    @property
+    def not_modified(self):
+        return self.status_code == 304
+
+    def close(self):
+        if self.body is not None:
+            self.body.close()
+
+
+def create_session(pool_size=len(ENDPOINTS)):
+    """
+    One keep-alive session shared by every endpoint.
+    Both ECT hosts get their own pool sized for a fully concurrent fetch.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def conditional_headers(validators):
+    """
+    If-None-Match / If-Modified-Since from the validators of the last snapshot.
+    """
+    headers = {}
+    if not validators:
+        return headers
+
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    return headers
+
+
+def spool_gzip(response):
+    """
+    Stream a response body into a gzip-compressed spooled file, hashing the
+    raw bytes on the way. The payload is never held (or parsed) in full.
+    Returns (body, content_hash, raw_bytes, compressed_bytes), body rewound.
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    digest = hashlib.sha256()
+    raw_bytes = 0
+
+    try:
+        with gzip.GzipFile(fileobj=body, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as gz:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                digest.update(chunk)
+                gz.write(chunk)
+                raw_bytes += len(chunk)
+    except Exception:
+        body.close()
+        raise
+
+    compressed_bytes = body.tell()
+    body.seek(0)
+
+    return body, digest.hexdigest(), raw_bytes, compressed_bytes
+
+
+def fetch(
+    session,
+    dataset,
+    validators=None,
+    max_retries=MAX_RETRIES,
+    backoff_seconds=BACKOFF_SECONDS,
+):
+    """
+    GET a single endpoint with a per-endpoint timeout and exponential backoff.
+    Connection errors, timeouts and 429/5xx responses are retried,
+    anything else is raised straight away.
+
+    When validators are given the request is conditional, a 304 comes back
+    as a FetchResult without body. Otherwise the body is a gzip spool the
+    caller has to close (FetchResult.close).
+    """
+    url = ENDPOINTS[dataset]
+    timeout = TIMEOUTS.get(dataset, DEFAULT_TIMEOUT)
+    headers = conditional_headers(validators)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        started = time.monotonic()
+
+        try:
+            with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+                fetched_at = datetime.utcnow()
+
+                response.raise_for_status()
+
+                if response.status_code == 304:
+                    body, content_hash, raw_bytes, compressed_bytes = None, None, 0, 0
+                else:
+                    body, content_hash, raw_bytes, compressed_bytes = spool_gzip(response)
+
+        except (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ):
+            if attempt > max_retries:
+                raise
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+            continue
+        except requests.HTTPError as e:
+            if e.response.status_code not in RETRY_STATUS_CODES or attempt > max_retries:
+                raise
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+            continue
+
+        return FetchResult(
+            dataset=dataset,
+            url=url,
+            status_code=response.status_code,
+            body=body,
+            fetched_at=fetched_at,
+            elapsed_seconds=time.monotonic() - started,
+            attempts=attempt,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=content_hash,
+            raw_bytes=raw_bytes,
+            compressed_bytes=compressed_bytes,
+        )
+
+
+def probe(session, dataset, timeout=DEFAULT_TIMEOUT):
+    """
+    Cheap change check: a HEAD request, no body is transferred.
+    Returns a fingerprint of the endpoint version built from its ETag,
+    Last-Modified and Content-Length, None if the server sends none of them.
+    """
+    response = session.head(ENDPOINTS[dataset], timeout=timeout)
+    response.raise_for_status()
+
+    parts = [
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+        response.headers.get("Content-Length"),
+    ]
+    if not any(parts):
+        return None
+
+    return "|".join(part or "" for part in parts)
+
+
+def fetch_all(session, datasets, validators=None, max_workers=len(ENDPOINTS), **fetch_kwargs):
+    """
+    Fetch several endpoints concurrently over the same session.
+    validators is an optional {dataset: {"etag", "last_modified"}} map.
+    Returns {dataset: FetchResult}. If a fetch fails, the bodies of the
+    others are closed before its error is raised.
+    """
+    datasets = list(datasets)
+    validators = validators or {}
+    if not datasets:
+        return {}
+
+    # leaving the pool waits for every fetch
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(datasets)))) as pool:
+        futures = {
+            dataset: pool.submit(
+                fetch, session, dataset, validators.get(dataset), **fetch_kwargs
+            )
+            for dataset in datasets
+        }
+
+    try:
+        return {dataset: future.result() for dataset, future in futures.items()}
+    except Exception:
+        for future in futures.values():
+            if future.exception() is None:
+                future.result().close()
+        raise
+
+
+def snapshot_skew_seconds(results):
+    """
+    Wall-clock spread between the first and last snapshot of a fetch_all call.
+    """
+    fetched = [r.fetched_at for r in results.values()]
+    if len(fetched) < 2:
+        return 0.0
+    return (max(fetched) - min(fetched)).total_seconds()
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+
+def is_blank(values):
+    return pd.isna(values) | (values == "")
+
+
+# strings int() parses: a signed whole number, surrounding whitespace
+WHOLE_NUMBER = r"\s*[+-]?\d+\s*"
+
+# infer_dtype results of values without any string
+NUMBER_TYPES = ("empty", "integer", "floating", "mixed-integer-float", "boolean")
+
+
+def to_int(values):
+    """
+    Vectorized safe_int: None, "" and anything non-numeric become <NA>.
+    Like int(), floats are truncated but strings must hold a whole number:
+    12.7 becomes 12, "12.7" becomes <NA>.
+    """
+    series = pd.Series(values, dtype=object)
+    numbers = pd.to_numeric(series, errors="coerce")
+
+    # columns of plain numbers skip the per-value string check
+    if infer_dtype(series, skipna=True) not in NUMBER_TYPES:
+        is_string = series.map(type).eq(str)
+        whole = series.where(is_string, "0").str.fullmatch(WHOLE_NUMBER)
+        numbers = numbers.mask(is_string & ~whole)
+
+    return np.trunc(numbers).astype("Int64").array
+
+
+def to_float(values):
+    """
+    Vectorized safe_float: None, "" and anything non-numeric become <NA>.
+    """
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    return numbers.astype("Float64").array
+
+
+# nullable, Arrow-backed strings, <NA> for missing values
+STRING_DTYPE = "string[pyarrow]"
+
+
+def as_strings(series, null):
+    """
+    str(value) as a string array, <NA> wherever null is True.
+    """
+    strings = series.astype(str).to_numpy(dtype=object)
+    return pd.array(np.where(null, None, strings), dtype=STRING_DTYPE)
+
+
+def to_id(values):
+    """
+    Vectorized str(value) for identifier columns, None and "" become <NA>.
+    """
+    series = pd.Series(values, dtype=object)
+    return as_strings(series, is_blank(series))
+
+
+def to_str(values):
+    """
+    Vectorized str(value), None becomes <NA>.
+    """
+    series = pd.Series(values, dtype=object)
+    return as_strings(series, series.isna())
+
+
+def to_joined(values):
+    """
+    List fields joined with ", ", anything that is not a list becomes <NA>.
+    """
+    return pd.array(
+        [", ".join(map(str, v)) if isinstance(v, list) else None for v in values],
+        dtype=STRING_DTYPE,
+    )
+
+
+CASTS = {
+    "int": to_int,
+    "float": to_float,
+    "id": to_id,
+    "str": to_str,
+    "joined": to_joined,
+}
+
+
+def flatten_nested(records, levels, types):
+    """
+    Columnar flattening of a nested JSON payload into a typed DataFrame.
+
+    levels describes one level of nesting each, outermost first:
+        [
+            (None, {"province_id": "prov_id"}),
+            ("constituencies", {"constituency_id": "cons_id", ...}),
+            ("candidates", {"party_id": "party_id", ...}),
+        ]
+    The first level is read from records itself, every following level from
+    the list under its key in the previous level. Fields map output column ->
+    source field, types map output column -> CASTS key ("str" by default).
+
+    Each column is gathered and cast once per level, on that level's own
+    item count, and parent columns are then broadcast to their children
+    with a single take per level. No per-row dict is ever built. Parents
+    without children produce no rows, like nested loops would.
+    """
+    items = records
+    columns = {}
+
+    for depth, (child_key, fields) in enumerate(levels):
+        if depth > 0:
+            children = [item.get(child_key) or [] for item in items]
+            counts = np.fromiter((len(c) for c in children), dtype=np.int64, count=len(children))
+            parent = np.repeat(np.arange(len(items)), counts)
+
+            columns = {name: values.take(parent) for name, values in columns.items()}
+            items = [child for group in children for child in group]
+
+        for name, source in fields.items():
+            cast = CASTS[types.get(name, "str")]
+            columns[name] = cast([item.get(source) for item in items])
+
+    return pd.DataFrame(columns)
+
+
+def to_python_nulls(df):
+    """
+    Object columns with None for every missing value, what the cleaned
+    frames used to be before nullable dtypes (kept for the benchmarks).
+    """
+    df = df.astype(object)
+    return df.where(df.notna(), None)
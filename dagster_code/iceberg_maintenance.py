@@ -0,0 +1,119 @@
+"""
+Iceberg table maintenance.
+
+Every ODS load and dbt run adds a snapshot and a few small data files, the
+MERGE loads also add delete files. Left alone, scans have to open more and
+more files and the metadata keeps growing. maintain_table runs, per table:
+
+- optimize: rewrites the files smaller than the target size (and the
+  delete files) into files of about the target size
+- expire_snapshots: drops the snapshots older than the retention
+- remove_orphan_files: deletes files no snapshot refers to anymore
+
+Retentions below 7d need iceberg.expire-snapshots.min-retention and
+iceberg.remove-orphan-files.min-retention lowered in the catalog
+(trino/etc/catalog/iceberg.properties).
+"""
+import time
+
+from dagster_code.ods_loader import run
+
+
+MAINTENANCE_CATALOG = "iceberg"
+MAINTENANCE_SCHEMAS = ("silver", "gold")
+
+TARGET_FILE_SIZE = "128MB"
+RETENTION = "7d"
+
+# schema.table -> retention of snapshots and orphan files, instead of RETENTION.
+# Every live-count run commits to these tables, every few minutes on count
+# night.
+TABLE_RETENTION = {
+    "silver.ods_stats_cons": "1d",
+    "silver.ods_stats_cons_snapshot": "1d",
+    "silver.ods_stats_party": "1d",
+    "silver.ods_stats_party_snapshot": "1d",
+    "gold.fact_vote_constituency": "1d",
+    "gold.fact_vote_party": "1d",
+    "gold.fact_vote_progress_constituency": "1d",
+    "gold.fact_vote_progress_party": "1d",
+    "gold.agg_party_province": "1d",
+    "gold.agg_turnout_province": "1d",
+    "gold.agg_winners_by_province": "1d",
+    "gold.seat_projection": "1d",
+}
+
+
+def list_tables(trino, schemas=MAINTENANCE_SCHEMAS):
+    """
+    schema.table of every Iceberg table in schemas, views left out.
+    """
+    names = ", ".join(f"'{schema}'" for schema in schemas)
+
+    rows = run(trino.cursor(), f"""
+        SELECT table_schema, table_name
+        FROM {MAINTENANCE_CATALOG}.information_schema.tables
+        WHERE table_schema IN ({names})
+        AND table_type = 'BASE TABLE'
+        ORDER BY table_schema, table_name
+    """)
+
+    return [f"{schema}.{table}" for schema, table in rows]
+
+
+def metadata_table(table, name):
+    schema, table = table.split(".")
+    return f'{MAINTENANCE_CATALOG}.{schema}."{table}${name}"'
+
+
+def file_stats(trino, table):
+    """
+    Files of the current snapshot and number of snapshots kept.
+    """
+    files, delete_files, total_bytes = run(trino.cursor(), f"""
+        SELECT
+            count(*),
+            count_if(content <> 0),
+            coalesce(sum(file_size_in_bytes), 0)
+        FROM {metadata_table(table, "files")}
+    """)[0]
+
+    snapshots = run(trino.cursor(), f"""
+        SELECT count(*) FROM {metadata_table(table, "snapshots")}
+    """)[0][0]
+
+    return {
+        "files": files,
+        "delete_files": delete_files,
+        "total_bytes": total_bytes,
+        "avg_file_bytes": total_bytes // files if files else 0,
+        "snapshots": snapshots,
+    }
+
+
+def maintain_table(trino, table, target_file_size=TARGET_FILE_SIZE, retention=RETENTION):
+    """
+    optimize, expire_snapshots and remove_orphan_files on one table.
+    trino should carry iceberg.target_max_file_size = target_file_size,
+    optimize writes files up to that size.
+    Returns the file stats before and after.
+    """
+    name = f"{MAINTENANCE_CATALOG}.{table}"
+    started = time.monotonic()
+
+    before = file_stats(trino, table)
+
+    cursor = trino.cursor()
+    run(cursor, f"ALTER TABLE {name} EXECUTE optimize(file_size_threshold => '{target_file_size}')")
+    run(cursor, f"ALTER TABLE {name} EXECUTE expire_snapshots(retention_threshold => '{retention}')")
+    run(cursor, f"ALTER TABLE {name} EXECUTE remove_orphan_files(retention_threshold => '{retention}')")
+
+    after = file_stats(trino, table)
+
+    return {
+        "table": table,
+        "retention": retention,
+        **{f"{key}_before": value for key, value in before.items()},
+        **{f"{key}_after": value for key, value in after.items()},
+        "seconds": round(time.monotonic() - started, 3),
+    }
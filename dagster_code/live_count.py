@@ -0,0 +1,179 @@
+"""
+Live-count mode for election night.
+
+stats_cons and stats_party change every few minutes while the count is
+running, the reference datasets do not change at all. live_count_sensor
+polls only the two stats endpoints with a HEAD request and, when one of
+them changed, runs live_count_job for that dataset's path from bronze to
+gold. The reference data stays on the daily schedule.
+
+The sensor is off by default, turn it on in the UI for the count night.
+LIVE_COUNT_INTERVAL_SECONDS sets the polling interval.
+"""
+import json
+import os
+from datetime import datetime
+
+import requests
+from dagster import (
+    AssetKey,
+    AssetRecordsFilter,
+    AssetSelection,
+    DagsterRunStatus,
+    DefaultSensorStatus,
+    RunRequest,
+    RunsFilter,
+    SkipReason,
+    define_asset_job,
+    sensor,
+)
+
+from dagster_code.ect_api import create_session, probe
+
+
+LIVE_COUNT_INTERVAL_SECONDS = int(os.getenv("LIVE_COUNT_INTERVAL_SECONDS", 60))
+
+# dataset -> assets refreshed when its endpoint changes
+LIVE_ASSETS = {
+    "stats_cons": [
+        "raw_stats_cons",
+        "cleaned_stats_cons",
+        "cleaned_stats_cons_changes",
+        "ods_stats_cons",
+        "ods_stats_cons_snapshot",
+        "fact_vote_constituency",
+        "fact_vote_progress_constituency",
+        "agg_party_province",
+        "agg_winners_by_province",
+        "agg_turnout_province",
+        "seat_projection",
+    ],
+    "stats_party": [
+        "raw_stats_party",
+        "cleaned_stats_party",
+        "ods_stats_party",
+        "ods_stats_party_snapshot",
+        "fact_vote_party",
+        "fact_vote_progress_party",
+        "seat_projection",
+    ],
+}
+
+# assets of LIVE_ASSETS that read both stats datasets -> their inputs.
+# Left out of a run until every input exists for the partition, e.g. the
+# first stats_cons change of the day has no cleaned_stats_party yet.
+SHARED_INPUTS = {
+    "seat_projection": ["cleaned_stats_cons", "cleaned_stats_party"],
+}
+
+# runs carry this tag, dagster.yaml limits it to one at a time
+LIVE_COUNT_TAG = "live_count"
+
+IN_PROGRESS_STATUSES = [
+    DagsterRunStatus.QUEUED,
+    DagsterRunStatus.NOT_STARTED,
+    DagsterRunStatus.STARTING,
+    DagsterRunStatus.STARTED,
+]
+
+
+live_count_job = define_asset_job(
+    name="live_count_job",
+    selection=AssetSelection.assets(
+        *dict.fromkeys(key for keys in LIVE_ASSETS.values() for key in keys)
+    ),
+    tags={LIVE_COUNT_TAG: "true"},
+)
+
+
+def is_live_run(context):
+    return LIVE_COUNT_TAG in context.run.tags
+
+
+def is_materialized(instance, key, partition_key):
+    result = instance.fetch_materializations(
+        AssetRecordsFilter(asset_key=AssetKey(key), asset_partitions=[partition_key]),
+        limit=1,
+    )
+    return bool(result.records)
+
+
+def live_run_assets(instance, changed, partition_key):
+    """
+    Asset keys of the run of every changed dataset. An asset of
+    SHARED_INPUTS is only in a run when its inputs exist for the
+    partition or come from that run or one requested before it (the
+    runs execute one after the other).
+    """
+    available = {
+        key
+        for inputs in SHARED_INPUTS.values()
+        for key in inputs
+        if is_materialized(instance, key, partition_key)
+    }
+
+    selections = {}
+    for dataset in changed:
+        available.update(LIVE_ASSETS[dataset])
+        selections[dataset] = [
+            AssetKey(key)
+            for key in LIVE_ASSETS[dataset]
+            if set(SHARED_INPUTS.get(key, [])) <= available
+        ]
+
+    return selections
+
+
+@sensor(
+    job=live_count_job,
+    minimum_interval_seconds=LIVE_COUNT_INTERVAL_SECONDS,
+    default_status=DefaultSensorStatus.STOPPED,
+)
+def live_count_sensor(context):
+    """
+    The cursor holds the last seen fingerprint of each stats endpoint.
+    No run is requested while a live_count_job run is still queued or
+    running, and the cursor is left alone so the change is picked up on
+    the next tick after it finished.
+    """
+    in_progress = context.instance.get_runs(
+        filters=RunsFilter(job_name=live_count_job.name, statuses=IN_PROGRESS_STATUSES),
+        limit=1,
+    )
+    if in_progress:
+        return SkipReason(f"Run {in_progress[0].run_id} still in progress")
+
+    previous = json.loads(context.cursor) if context.cursor else {}
+
+    try:
+        with create_session(pool_size=len(LIVE_ASSETS)) as session:
+            current = {dataset: probe(session, dataset) for dataset in LIVE_ASSETS}
+    except requests.RequestException as e:
+        return SkipReason(f"Stats endpoints not reachable: {e}")
+
+    # no validators at all = no cheap check, let raw_* compare content hashes
+    changed = [
+        dataset
+        for dataset, fingerprint in current.items()
+        if fingerprint is None or fingerprint != previous.get(dataset)
+    ]
+
+    if not changed:
+        return SkipReason("Stats endpoints unchanged")
+
+    context.update_cursor(json.dumps(current))
+
+    # one run per dataset: Dagster skips a step as soon as one of its
+    # upstream steps in the run is skipped, so in a shared run an
+    # unchanged endpoint (skipped by raw_*) would also skip the dbt models
+    # of the other one. LIVE_COUNT_TAG runs them one after the other.
+    partition_key = datetime.utcnow().strftime("%Y-%m-%d")
+
+    return [
+        RunRequest(
+            partition_key=partition_key,
+            asset_selection=selection,
+            tags={LIVE_COUNT_TAG: "true"},
+        )
+        for selection in live_run_assets(context.instance, changed, partition_key).values()
+    ]
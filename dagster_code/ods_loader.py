@@ -0,0 +1,474 @@
+import io
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dagster_code.bronze_store import BUCKET_NAME
+
+
+# Parquet files for bulk loads are staged here and exposed to Trino as
+# external tables of the hive catalog (trino/etc/catalog/hive.properties).
+STAGING_PREFIX = "staging/ods"
+STAGING_SCHEMA = "hive.staging"
+
+ARROW_TYPES = {
+    "VARCHAR": pa.string(),
+    "INTEGER": pa.int32(),
+    "DOUBLE": pa.float64(),
+    "DATE": pa.date32(),
+    # snapshot timestamps only have second resolution
+    "TIMESTAMP(6)": pa.timestamp("ms"),
+}
+
+# hive.staging column types where they differ from the Iceberg ones, the
+# hive connector maps Parquet timestamps to TIMESTAMP(3) by default
+STAGING_TYPES = {
+    "TIMESTAMP(6)": "TIMESTAMP",
+}
+
+
+# VALUES loads: batches are sized so one statement stays under
+# MAX_STATEMENT_BYTES (Trino's query.max-length is 1,000,000) and takes
+# about TARGET_BATCH_SECONDS.
+INITIAL_BATCH_ROWS = 1000
+MIN_BATCH_ROWS = 50
+MAX_BATCH_ROWS = 50_000
+MAX_STATEMENT_BYTES = 900_000
+TARGET_BATCH_SECONDS = 2.0
+
+# quotes, type keyword and separators around every bound literal
+VALUE_OVERHEAD_BYTES = 10
+
+
+def run(cursor, sql, params=None):
+    """
+    Execute a statement and wait for it to finish.
+    """
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+
+def without_nulls(series):
+    return series.where(series.notna(), None).tolist()
+
+
+def encode_int(series):
+    return without_nulls(pd.to_numeric(series).astype("Int64").astype(object))
+
+
+def encode_double(series):
+    return without_nulls(pd.to_numeric(series).astype("Float64").astype(object))
+
+
+def encode_varchar(series):
+    series = series.astype(object)
+    return [None if v is None else str(v) for v in without_nulls(series)]
+
+
+def encode_date(series):
+    return without_nulls(pd.to_datetime(series).dt.date.astype(object))
+
+
+def encode_timestamp(series):
+    return without_nulls(pd.to_datetime(series).astype(object))
+
+
+# Trino type -> column encoder producing Python values the client binds as
+# INTEGER, DOUBLE '...', '...', DATE '...' and TIMESTAMP '...' literals.
+# Nulls (None, NaN, <NA>, NaT) all become NULL.
+ENCODERS = {
+    "INTEGER": encode_int,
+    "DOUBLE": encode_double,
+    "VARCHAR": encode_varchar,
+    "DATE": encode_date,
+    "TIMESTAMP(6)": encode_timestamp,
+}
+
+
+def quote(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+# Trino type -> literal, for the columns loads are scoped by
+LITERALS = {
+    "INTEGER": lambda value: str(int(value)),
+    "VARCHAR": quote,
+    "DATE": lambda value: f"DATE {quote(value)}",
+}
+
+
+def replace_conditions(dataset, df):
+    """
+    {column: [value]} of the replace_key columns of df, the rows a load
+    of df replaces. A load never spans two partitions.
+    """
+    conditions = {}
+
+    for name in dataset.replace_key:
+        values = df[name].unique()
+        if len(values) != 1:
+            raise Exception(f"{dataset.name}: a load must have exactly one {name}, got {len(values)}")
+
+        conditions[name] = [values[0]]
+
+    return conditions
+
+
+def render_conditions(dataset, conditions, alias=None):
+    """
+    SQL for {column: [values]} conditions, rendered as literals so
+    statements only touch the partitions they name.
+    """
+    types = {column.name: column.type for column in dataset.columns}
+    prefix = f"{alias}." if alias else ""
+    terms = []
+
+    for name, values in conditions.items():
+        literals = [LITERALS[types[name]](value) for value in values]
+
+        if len(literals) == 1:
+            terms.append(f"{prefix}{name} = {literals[0]}")
+        else:
+            terms.append(f"{prefix}{name} IN ({', '.join(literals)})")
+
+    return " AND ".join(terms)
+
+
+def encode_rows(dataset, df):
+    """
+    Rows of bound parameters, encoded by the declared column type.
+    """
+    columns = [ENCODERS[column.type](df[column.name]) for column in dataset.columns]
+    return list(zip(*columns))
+
+
+def row_bytes(row):
+    return sum(len(str(v)) + VALUE_OVERHEAD_BYTES for v in row)
+
+
+class AdaptiveBatcher:
+    """
+    Picks the next batch size from the measured latency of the previous
+    statements, capped by statement byte length.
+    """
+
+    def __init__(
+        self,
+        initial_rows=INITIAL_BATCH_ROWS,
+        target_seconds=TARGET_BATCH_SECONDS,
+        max_statement_bytes=MAX_STATEMENT_BYTES,
+    ):
+        self.rows = initial_rows
+        self.target_seconds = target_seconds
+        self.max_statement_bytes = max_statement_bytes
+
+    def take(self, sizes, start):
+        """
+        End index of the next batch starting at start, sizes are row bytes.
+        """
+        end = start
+        budget = self.max_statement_bytes
+
+        while end < len(sizes) and end - start < self.rows and sizes[end] <= budget:
+            budget -= sizes[end]
+            end += 1
+
+        # a single oversized row still has to go somewhere
+        return max(end, start + 1)
+
+    def record(self, rows, seconds):
+        if seconds <= 0:
+            return
+
+        # move halfway towards the size that would have hit the target
+        ideal = rows * self.target_seconds / seconds
+        self.rows = int(min(MAX_BATCH_ROWS, max(MIN_BATCH_ROWS, (self.rows + ideal) / 2)))
+
+
+def values_load(trino, dataset, df, batcher=None, log=None, conditions=None):
+    """
+    Load a cleaned DataFrame with parameterized INSERT ... VALUES batches.
+    Values are encoded from the schema registry types, batch sizes adapt to
+    statement bytes and Trino latency.
+    conditions select the rows replaced, the replace_key partition of df
+    by default.
+    Returns load stats including one entry per batch.
+    """
+    batcher = batcher or AdaptiveBatcher()
+    predicate = render_conditions(dataset, conditions or replace_conditions(dataset, df))
+
+    rows = encode_rows(dataset, df)
+    sizes = [row_bytes(row) for row in rows]
+
+    columns = ", ".join(dataset.column_names)
+    row_template = "(" + ", ".join("?" for _ in dataset.columns) + ")"
+
+    batches = []
+    started = time.monotonic()
+    cursor = trino.cursor()
+
+    try:
+        # Idempotent delete
+        run(cursor, f"DELETE FROM {dataset.table} WHERE {predicate}")
+
+        # Batch insert
+        start = 0
+        while start < len(rows):
+            end = batcher.take(sizes, start)
+            batch = rows[start:end]
+
+            sql = (
+                f"INSERT INTO {dataset.table} ({columns}) VALUES "
+                + ", ".join(row_template for _ in batch)
+            )
+            params = [v for row in batch for v in row]
+
+            batch_started = time.monotonic()
+            run(cursor, sql, params)
+            seconds = time.monotonic() - batch_started
+
+            batcher.record(len(batch), seconds)
+
+            stats = {
+                "rows": len(batch),
+                "statement_bytes": len(sql) + sum(sizes[start:end]),
+                "seconds": round(seconds, 3),
+                "rows_per_sec": round(len(batch) / seconds) if seconds > 0 else None,
+            }
+            batches.append(stats)
+
+            if log:
+                log(
+                    f"Batch {len(batches)}: {stats['rows']} rows, "
+                    f"{stats['statement_bytes']} bytes, {stats['seconds']}s"
+                )
+
+            start = end
+
+        trino.commit()
+
+    finally:
+        cursor.close()
+
+    seconds = time.monotonic() - started
+
+    return {
+        "rows": len(rows),
+        "statements": len(batches),
+        "avg_statement_bytes": round(sum(b["statement_bytes"] for b in batches) / max(len(batches), 1)),
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(len(rows) / seconds) if seconds > 0 else None,
+        "batches": batches,
+    }
+
+
+def delete_rows(trino, dataset, conditions):
+    started = time.monotonic()
+    cursor = trino.cursor()
+
+    try:
+        run(cursor, f"DELETE FROM {dataset.table} WHERE {render_conditions(dataset, conditions)}")
+        trino.commit()
+    finally:
+        cursor.close()
+
+    return {
+        "rows": 0,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def arrow_schema(dataset):
+    return pa.schema([
+        pa.field(column.name, ARROW_TYPES[column.type], nullable=column.nullable)
+        for column in dataset.columns
+    ])
+
+
+def to_parquet_bytes(dataset, df):
+    table = pa.Table.from_pandas(
+        df[dataset.column_names],
+        schema=arrow_schema(dataset),
+        preserve_index=False,
+    )
+
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+@contextmanager
+def staged(trino, s3, dataset, df):
+    """
+    Stage a cleaned DataFrame as one Parquet file under
+    s3://<bucket>/staging/ods/... exposed as an external hive.staging
+    table. Yields (staging table, cursor, Parquet bytes), drops the table
+    and its file afterwards.
+    """
+    load_id = uuid.uuid4().hex[:8]
+
+    staging_dir = f"{STAGING_PREFIX}/{dataset.name}/{load_id}/"
+    staging_key = f"{staging_dir}part-0.parquet"
+    staging_table = f"{STAGING_SCHEMA}.{dataset.name}_{load_id}"
+
+    column_defs = ", ".join(
+        f"{column.name} {STAGING_TYPES.get(column.type, column.type)}"
+        for column in dataset.columns
+    )
+
+    body = to_parquet_bytes(dataset, df)
+
+    s3.put_object(Bucket=BUCKET_NAME, Key=staging_key, Body=body)
+
+    cursor = trino.cursor()
+
+    try:
+        run(cursor, f"""
+            CREATE TABLE {staging_table} ({column_defs})
+            WITH (
+                external_location = 's3://{BUCKET_NAME}/{staging_dir}',
+                format = 'PARQUET'
+            )
+        """)
+
+        try:
+            yield staging_table, cursor, len(body)
+        finally:
+            run(cursor, f"DROP TABLE IF EXISTS {staging_table}")
+
+    finally:
+        cursor.close()
+        s3.delete_object(Bucket=BUCKET_NAME, Key=staging_key)
+
+
+def bulk_load(trino, s3, dataset, df, conditions=None):
+    """
+    Load a cleaned DataFrame into its Iceberg table through Parquet:
+
+    1. stage the frame as an external hive.staging table (staged)
+    2. DELETE the replaced rows, INSERT INTO ... SELECT from staging
+    3. drop the staging table and its file
+
+    Trino plans one INSERT instead of parsing a VALUES statement per batch.
+    conditions select the rows replaced, the replace_key partition of df
+    by default.
+    Returns load stats.
+    """
+    conditions = conditions or replace_conditions(dataset, df)
+
+    if df.empty:
+        # nothing to stage, only rows to remove
+        return delete_rows(trino, dataset, conditions)
+
+    columns = ", ".join(dataset.column_names)
+    started = time.monotonic()
+
+    with staged(trino, s3, dataset, df) as (staging_table, cursor, parquet_bytes):
+        # Idempotent delete
+        run(cursor, f"DELETE FROM {dataset.table} WHERE {render_conditions(dataset, conditions)}")
+
+        run(cursor, f"""
+            INSERT INTO {dataset.table} ({columns})
+            SELECT {columns} FROM {staging_table}
+        """)
+
+        trino.commit()
+
+    return {
+        "rows": len(df),
+        "parquet_bytes": parquet_bytes,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def merge_load(trino, s3, dataset, df, conditions=None):
+    """
+    Upsert a cleaned DataFrame into its Iceberg table with a single MERGE
+    from a staged Parquet batch, matched on the dataset's natural key
+    within the replaced rows (conditions, the replace_key partition of df
+    by default):
+
+    - rows whose values changed are updated, unchanged rows are left alone
+    - new keys are inserted
+    - keys of the replaced rows that are missing from df are deleted
+
+    The whole change is one Iceberg commit, readers see either the old or
+    the new rows, never an empty partition.
+    Returns load stats.
+    """
+    conditions = conditions or replace_conditions(dataset, df)
+
+    if not dataset.key:
+        raise Exception(f"{dataset.name}: no natural key declared, cannot MERGE")
+
+    if df.empty:
+        return delete_rows(trino, dataset, conditions)
+
+    match = list(dict.fromkeys(dataset.replace_key + dataset.key))
+
+    # a constituency without results yet has one row with a NULL party_id,
+    # so key columns are matched null-safe
+    if df[list(dataset.replace_key)].isna().any().any():
+        raise Exception(f"{dataset.name}: NULL in {dataset.replace_key}, cannot MERGE")
+    if df.duplicated(match).any():
+        raise Exception(f"{dataset.name}: duplicate keys {match}, cannot MERGE")
+
+    columns = dataset.column_names
+    values = [name for name in columns if name not in match]
+    types = {column.name: column.type for column in dataset.columns}
+
+    removed_columns = ", ".join(
+        f"cur.{name}" if name in match else f"CAST(NULL AS {types[name]}) AS {name}"
+        for name in columns
+    )
+    on = " AND ".join(f"t.{name} IS NOT DISTINCT FROM s.{name}" for name in match)
+    staging_on = " AND ".join(f"cur.{name} IS NOT DISTINCT FROM st.{name}" for name in match)
+
+    when_changed = ""
+    if values:
+        changed = " OR ".join(f"t.{name} IS DISTINCT FROM s.{name}" for name in values)
+        updates = ", ".join(f"{name} = s.{name}" for name in values)
+        when_changed = f"WHEN MATCHED AND ({changed}) THEN UPDATE SET {updates}"
+
+    started = time.monotonic()
+
+    with staged(trino, s3, dataset, df) as (staging_table, cursor, parquet_bytes):
+        result = run(cursor, f"""
+            MERGE INTO {dataset.table} t
+            USING (
+                SELECT {", ".join(columns)}, false AS removed
+                FROM {staging_table}
+
+                UNION ALL
+
+                SELECT {removed_columns}, true AS removed
+                FROM (
+                    SELECT {", ".join(match)}
+                    FROM {dataset.table}
+                    WHERE {render_conditions(dataset, conditions)}
+                ) cur
+                LEFT JOIN {staging_table} st
+                ON {staging_on}
+                WHERE st.{dataset.replace_key[0]} IS NULL
+            ) s
+            ON {on} AND {render_conditions(dataset, conditions, alias="t")}
+            WHEN MATCHED AND s.removed THEN DELETE
+            {when_changed}
+            WHEN NOT MATCHED AND NOT s.removed THEN
+                INSERT ({", ".join(columns)})
+                VALUES ({", ".join(f"s.{name}" for name in columns)})
+        """)
+
+        trino.commit()
+
+    return {
+        "rows": len(df),
+        # rows inserted, updated or deleted
+        "rows_merged": result[0][0] if result else None,
+        "parquet_bytes": parquet_bytes,
+        "seconds": round(time.monotonic() - started, 3),
+    }
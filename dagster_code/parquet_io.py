@@ -0,0 +1,95 @@
+"""
+IO manager handing DataFrames from the cleaned_* assets to their
+downstream assets as Parquet on MinIO instead of local pickles:
+
+    silver/_io/<asset>/<partition>.parquet
+
+Columns of the table declared in the schema registry (the "dataset"
+definition metadata of the asset) are written with their table types,
+other columns with the types Arrow infers. Reads come back as
+Arrow-backed columns (pd.ArrowDtype), typed and nullable, without copying
+the decoded buffers.
+"""
+import io
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dagster import IOManager
+
+from dagster_code.bronze_store import BUCKET_NAME
+from dagster_code.ods_loader import ARROW_TYPES
+from dagster_code.schemas import SCHEMAS
+
+
+IO_ROOT = "silver/_io"
+COMPRESSION = "zstd"
+
+
+def io_key(context):
+    path = "/".join(context.asset_key.path)
+    partition = context.asset_partition_key if context.has_asset_partitions else "all"
+    return f"{IO_ROOT}/{path}/{partition}.parquet"
+
+
+def to_arrow(df, dataset=None):
+    """
+    Arrow table of df, columns of the dataset's table cast to their table
+    types (an all-NULL column would otherwise come out as type null).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if dataset is None:
+        return table
+
+    types = {column.name: ARROW_TYPES[column.type] for column in SCHEMAS[dataset].columns}
+    schema = pa.schema([
+        field.with_type(types[field.name]) if field.name in types else field
+        for field in table.schema
+    ])
+    return table.cast(schema)
+
+
+class ParquetIOManager(IOManager):
+
+    def __init__(self, s3):
+        self.s3 = s3
+
+    def handle_output(self, context, obj):
+        started = time.monotonic()
+
+        table = to_arrow(obj, context.definition_metadata.get("dataset"))
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression=COMPRESSION)
+        serialize_seconds = time.monotonic() - started
+
+        key = io_key(context)
+        self.s3.put_object(Bucket=BUCKET_NAME, Key=key, Body=buffer.getvalue())
+
+        context.add_output_metadata({
+            "io_key": key,
+            "io_rows": table.num_rows,
+            "io_memory_bytes": int(obj.memory_usage(deep=True).sum()),
+            "io_parquet_bytes": buffer.tell(),
+            "io_serialize_seconds": round(serialize_seconds, 3),
+            "io_write_seconds": round(time.monotonic() - started, 3),
+        })
+
+    def load_input(self, context):
+        started = time.monotonic()
+
+        key = io_key(context)
+        body = self.s3.get_object(Bucket=BUCKET_NAME, Key=key)["Body"].read()
+
+        # the Arrow buffers are reused by the DataFrame, not copied
+        table = pq.read_table(pa.BufferReader(body))
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+
+        context.add_input_metadata({
+            "io_key": key,
+            "io_parquet_bytes": len(body),
+            "io_read_seconds": round(time.monotonic() - started, 3),
+        })
+
+        return df
@@ -0,0 +1,23 @@
+from datetime import date, datetime
+
+from dagster import DailyPartitionsDefinition
+
+
+# One partition per ingestion_date, shared by every asset from raw_* to
+# the dbt gold models. end_offset=1 makes today's (still running) day a
+# partition, so the daily schedule loads today and not yesterday.
+daily_partitions = DailyPartitionsDefinition(
+    start_date="2026-02-01",
+    end_offset=1,
+)
+
+
+def partition_date(context):
+    """
+    ingestion_date of the partition being materialized.
+    """
+    return date.fromisoformat(context.partition_key)
+
+
+def is_today(ingestion_date):
+    return ingestion_date == datetime.utcnow().date()
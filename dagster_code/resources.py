@@ -1,9 +1,11 @@
 import os
 import boto3
-import trino
-from dagster import resource
-from pathlib import Path
-from dagster_dbt import DbtCliResource
+from dagster import Field, Map, io_manager, resource
+
+from dagster_code.dbt_build import DBT_THREADS, DbtResource
+from dagster_code.dbt_manifest import DBT_PROJECT_DIR
+from dagster_code.parquet_io import ParquetIOManager
+from dagster_code.trino_client import POOL_SIZE, TrinoClient
 
 
 
@@ -17,18 +19,56 @@ def s3():
     )
 
 
-@resource
-def trino_resource(_):
-    return trino.dbapi.connect(
-        host=os.getenv("TRINO_HOST", "trino"),
-        port=int(os.getenv("TRINO_PORT", 8080)),
-        user="admin",
-        catalog="iceberg",
-        schema="silver",
+@resource(
+    config_schema={
+        "host": Field(str, default_value=os.getenv("TRINO_HOST", "trino")),
+        "port": Field(int, default_value=int(os.getenv("TRINO_PORT", 8080))),
+        "user": Field(str, default_value=os.getenv("TRINO_USER", "admin")),
+        "catalog": Field(str, default_value="iceberg"),
+        "schema": Field(str, default_value="silver"),
+        # idle connections kept per set of session properties
+        "pool_size": Field(int, default_value=POOL_SIZE),
+        # defaults for every query, assets add their own with .session()
+        "session_properties": Field(Map(str, str), default_value={}),
+    }
+)
+def trino_resource(init_context):
+    config = init_context.resource_config
+
+    client = TrinoClient(
+        connect_kwargs={
+            "host": config["host"],
+            "port": config["port"],
+            "user": config["user"],
+            "catalog": config["catalog"],
+            "schema": config["schema"],
+        },
+        session_properties=config["session_properties"],
+        pool_size=config["pool_size"],
     )
 
-@resource
-def dbt():
-    return DbtCliResource(
-        project_dir="/opt/dagster/app/dbt_election",
+    try:
+        yield client
+    finally:
+        # hand the connections back to the pool
+        client.close()
+
+@io_manager(required_resource_keys={"s3"})
+def parquet_io_manager(init_context):
+    return ParquetIOManager(init_context.resources.s3)
+
+@resource(
+    config_schema={
+        "threads": Field(int, default_value=int(os.getenv("DBT_THREADS", DBT_THREADS))),
+        # model name -> table, incremental or view, overrides the model config
+        "materializations": Field(Map(str, str), default_value={}),
+    }
+)
+def dbt(init_context):
+    config = init_context.resource_config
+
+    return DbtResource(
+        project_dir=os.fspath(DBT_PROJECT_DIR),
+        threads=config["threads"],
+        materializations=config["materializations"],
     )
\ No newline at end of file
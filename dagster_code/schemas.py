@@ -0,0 +1,366 @@
+"""
+Schema registry for the silver layer, and the gold tables written from
+Python.
+
+One declaration per dataset drives both the cleaned_* transform (payload
+path, renames, casts, nullability, column order) and the Iceberg DDL in
+infra/sql/iceberg-table-setup.sql. Regenerate the DDL after changing a
+declaration:
+
+    python -m dagster_code.schemas > infra/sql/iceberg-table-setup.sql
+
+The DDL only creates missing tables, a new partitioning or sorted_by of
+an existing table is applied with ALTER TABLE ... SET PROPERTIES (and
+optimize to rewrite the files already written).
+"""
+from dataclasses import dataclass, field, replace
+
+import pandas as pd
+import pyarrow as pa
+
+from dagster_code.flatten import flatten_nested
+
+
+# Trino type -> flatten cast
+TYPE_CASTS = {
+    "VARCHAR": "str",
+    "INTEGER": "int",
+    "DOUBLE": "float",
+}
+
+
+class SchemaDriftError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: str
+    # field in the payload, None for columns filled by the pipeline
+    source: str = None
+    # nesting level the source field lives on (index into Dataset.children)
+    level: int = 0
+    nullable: bool = True
+    # value used for nulls, makes the column effectively NOT NULL
+    default: object = None
+    # override of the cast derived from type, see flatten.CASTS
+    cast: str = None
+    # missing from every payload item at its level = drift
+    required: bool = True
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    table: str
+    columns: list
+    # keys leading from the bronze payload to the list of top-level items
+    root: tuple = ()
+    # key of the child list for every level below the top one
+    children: tuple = ()
+    # Iceberg partition fields, transforms allowed ("bucket(province_id, 8)")
+    partitioning: tuple = ("ingestion_date",)
+    # Iceberg sort order, every file is written sorted on it so min/max
+    # statistics of files and row groups let filters skip them
+    sorted_by: tuple = ()
+    # columns identifying the rows one load replaces (DELETE before INSERT)
+    replace_key: tuple = ("ingestion_date",)
+    # natural key of a row within replace_key, what MERGE loads match on
+    key: tuple = ()
+    levels: list = field(init=False, repr=False)
+    types: dict = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # compile the declaration into flatten_nested levels once
+        levels = [
+            (key, {})
+            for key in (None,) + tuple(self.children)
+        ]
+        types = {}
+
+        for column in self.columns:
+            if column.source is None:
+                continue
+            levels[column.level][1][column.name] = column.source
+            types[column.name] = column.cast or TYPE_CASTS[column.type]
+
+        object.__setattr__(self, "levels", levels)
+        object.__setattr__(self, "types", types)
+
+    @property
+    def column_names(self):
+        return [column.name for column in self.columns]
+
+    def records(self, payload):
+        for key in self.root:
+            payload = (payload or {}).get(key)
+
+        if payload is None:
+            return []
+        if isinstance(payload, dict):
+            return [payload]
+        return payload
+
+    def check_drift(self, records):
+        """
+        Raise when a required source field is missing from every item of
+        its level, before anything reaches Trino.
+        """
+        items = records
+
+        for depth, (child_key, fields) in enumerate(self.levels):
+            if depth > 0:
+                items = [child for item in items for child in (item.get(child_key) or [])]
+            if not items:
+                return
+
+            present = set().union(*map(dict.keys, items))
+            missing = [
+                column.source
+                for column in self.columns
+                if column.level == depth
+                and column.source is not None
+                and column.required
+                and column.source not in present
+            ]
+
+            if missing:
+                raise SchemaDriftError(
+                    f"{self.name}: payload is missing {missing} at level {depth}"
+                )
+
+    def transform(self, payload, ingestion_date):
+        """
+        Bronze payload -> typed DataFrame in table column order.
+        Empty DataFrame when the payload has no rows.
+        """
+        records = self.records(payload)
+        self.check_drift(records)
+
+        df = flatten_nested(records, self.levels, self.types)
+
+        if df.empty:
+            return pd.DataFrame()
+
+        df["ingestion_date"] = pd.array([ingestion_date] * len(df), dtype=pd.ArrowDtype(pa.date32()))
+
+        for column in self.columns:
+            if column.default is not None:
+                df[column.name] = df[column.name].fillna(column.default)
+
+        df = df[self.column_names]
+        self.validate(df)
+
+        return df
+
+    def validate(self, df):
+        """
+        Column names/order must match the table and NOT NULL columns must
+        not contain nulls.
+        """
+        if list(df.columns) != self.column_names:
+            raise SchemaDriftError(
+                f"{self.name}: columns {list(df.columns)} do not match {self.column_names}"
+            )
+
+        for column in self.columns:
+            if not column.nullable and df[column.name].isna().any():
+                raise SchemaDriftError(f"{self.name}: NULL in NOT NULL column {column.name}")
+
+    def create_table_sql(self):
+        columns = ",\n".join(
+            f"    {column.name} {column.type}" + ("" if column.nullable else " NOT NULL")
+            for column in self.columns
+        )
+        properties = [
+            "format = 'PARQUET'",
+            "partitioning = ARRAY[" + ", ".join(f"'{p}'" for p in self.partitioning) + "]",
+        ]
+        if self.sorted_by:
+            properties.append("sorted_by = ARRAY[" + ", ".join(f"'{s}'" for s in self.sorted_by) + "]")
+
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.table} (\n"
+            f"{columns}\n"
+            f")\n"
+            f"WITH (\n"
+            + ",\n".join(f"    {p}" for p in properties) + "\n"
+            ");"
+        )
+
+
+INGESTION_DATE = Column("ingestion_date", "DATE", nullable=False)
+
+# Bronze snapshot a row comes from, filled from the bronze key
+SNAPSHOT_COLUMNS = [
+    Column("batch_id", "VARCHAR", nullable=False),
+    Column("snapshot_ts", "TIMESTAMP(6)", nullable=False),
+]
+
+
+def snapshot_history(dataset):
+    """
+    <table>_snapshot: every bronze snapshot of a dataset, one partition
+    per batch_id, where the ODS table only keeps the last one of a day.
+    """
+    return replace(
+        dataset,
+        name=f"{dataset.name}_snapshot",
+        table=f"{dataset.table}_snapshot",
+        columns=dataset.columns + SNAPSHOT_COLUMNS,
+        partitioning=("ingestion_date", "batch_id"),
+        replace_key=("ingestion_date", "batch_id"),
+    )
+
+
+SCHEMAS = {
+    "constituency": Dataset(
+        name="constituency",
+        table="iceberg.silver.ods_constituency",
+        key=("constituency_id",),
+        columns=[
+            Column("constituency_id", "VARCHAR", "cons_id"),
+            Column("constituency_no", "INTEGER", "cons_no", nullable=False, default=0),
+            Column("prov_id", "VARCHAR", "prov_id"),
+            Column("zone", "VARCHAR", "zone", cast="joined", required=False),
+            Column("total_vote_stations", "INTEGER", "total_vote_stations", nullable=False, default=0),
+            Column("registered_vote", "INTEGER", "registered_vote", nullable=False, default=0),
+            INGESTION_DATE,
+        ],
+    ),
+    "mp_candidate": Dataset(
+        name="mp_candidate",
+        table="iceberg.silver.ods_mp_candidate",
+        key=("mp_candidate_id",),
+        columns=[
+            Column("mp_candidate_id", "VARCHAR", "mp_app_id"),
+            Column("candidate_no", "INTEGER", "mp_app_no", nullable=False, default=0),
+            Column("party_id", "INTEGER", "mp_app_party_id", nullable=False, default=0),
+            Column("candidate_name", "VARCHAR", "mp_app_name"),
+            Column("image_url", "VARCHAR", "image_url"),
+            INGESTION_DATE,
+        ],
+    ),
+    "party_candidate": Dataset(
+        name="party_candidate",
+        table="iceberg.silver.ods_party_candidate",
+        key=("party_no", "list_no"),
+        children=("party_list_candidates",),
+        columns=[
+            Column("party_no", "INTEGER", "party_no"),
+            Column("list_no", "INTEGER", "list_no", level=1),
+            Column("candidate_name", "VARCHAR", "name", level=1),
+            Column("image_url", "VARCHAR", "image_url", level=1),
+            INGESTION_DATE,
+        ],
+    ),
+    "party": Dataset(
+        name="party",
+        table="iceberg.silver.ods_party",
+        key=("party_id",),
+        columns=[
+            Column("party_id", "INTEGER", "id"),
+            Column("party_no", "INTEGER", "party_no"),
+            Column("party_name", "VARCHAR", "name"),
+            Column("party_abbr", "VARCHAR", "abbr"),
+            Column("party_color", "VARCHAR", "color"),
+            Column("logo_url", "VARCHAR", "logo_url"),
+            INGESTION_DATE,
+        ],
+    ),
+    "province": Dataset(
+        name="province",
+        table="iceberg.silver.ods_province",
+        key=("province_id",),
+        root=("province",),
+        columns=[
+            Column("province_id", "INTEGER", "province_id"),
+            Column("prov_id", "VARCHAR", "prov_id"),
+            Column("province", "VARCHAR", "province"),
+            Column("abbre_thai", "VARCHAR", "abbre_thai"),
+            Column("eng", "VARCHAR", "eng"),
+            INGESTION_DATE,
+        ],
+    ),
+    "stats_cons": Dataset(
+        name="stats_cons",
+        table="iceberg.silver.ods_stats_cons",
+        key=("constituency_id", "party_id"),
+        # dashboards filter by province and constituency
+        sorted_by=("province_id", "constituency_id"),
+        root=("result_province",),
+        children=("constituencies", "candidates"),
+        columns=[
+            Column("constituency_id", "VARCHAR", "cons_id", level=1, cast="id"),
+            Column("province_id", "VARCHAR", "prov_id", level=0, cast="id"),
+            Column("party_id", "INTEGER", "party_id", level=2),
+            Column("vote", "INTEGER", "mp_app_vote", level=2),
+            Column("vote_percent", "DOUBLE", "mp_app_vote_percent", level=2),
+            Column("rank", "INTEGER", "mp_app_rank", level=2),
+            Column("turn_out", "INTEGER", "turn_out", level=1),
+            Column("percent_turn_out", "DOUBLE", "percent_turn_out", level=1),
+            Column("valid_votes", "INTEGER", "valid_votes", level=1),
+            Column("invalid_votes", "INTEGER", "invalid_votes", level=1),
+            Column("blank_votes", "INTEGER", "blank_votes", level=1),
+            INGESTION_DATE,
+        ],
+    ),
+    "stats_party": Dataset(
+        name="stats_party",
+        table="iceberg.silver.ods_stats_party",
+        key=("party_id",),
+        children=("result_party",),
+        columns=[
+            Column("party_id", "INTEGER", "party_id", level=1),
+            Column("party_vote", "INTEGER", "party_vote", level=1),
+            Column("party_vote_percent", "DOUBLE", "party_vote_percent", level=1),
+            Column("mp_app_vote", "INTEGER", "mp_app_vote", level=1),
+            Column("mp_app_vote_percent", "DOUBLE", "mp_app_vote_percent", level=1),
+            Column("first_mp_app_count", "INTEGER", "first_mp_app_count", level=1),
+            Column("counted_vote_stations", "INTEGER", "counted_vote_stations"),
+            Column("percent_count", "DOUBLE", "percent_count"),
+            INGESTION_DATE,
+        ],
+    ),
+}
+
+# the live counts, kept per snapshot for the vote progress facts
+SCHEMAS["stats_cons_snapshot"] = snapshot_history(SCHEMAS["stats_cons"])
+SCHEMAS["stats_party_snapshot"] = snapshot_history(SCHEMAS["stats_party"])
+
+# gold table written by the seat_projection asset (dagster_code/seats.py)
+SCHEMAS["seat_projection"] = Dataset(
+    name="seat_projection",
+    table="iceberg.gold.seat_projection",
+    key=("party_id",),
+    columns=[
+        Column("party_id", "INTEGER", nullable=False),
+        Column("constituency_seats", "INTEGER", nullable=False),
+        Column("party_list_seats", "INTEGER", nullable=False),
+        Column("total_seats", "INTEGER", nullable=False),
+        Column("projected_seats_mean", "DOUBLE"),
+        Column("projected_seats_p05", "DOUBLE"),
+        Column("projected_seats_p95", "DOUBLE"),
+        Column("majority_probability", "DOUBLE"),
+        Column("simulations", "INTEGER"),
+        Column("percent_count", "DOUBLE"),
+        INGESTION_DATE,
+    ] + SNAPSHOT_COLUMNS,
+)
+
+
+def iceberg_ddl():
+    header = (
+        "CREATE SCHEMA IF NOT EXISTS iceberg.silver;\n"
+        "CREATE SCHEMA IF NOT EXISTS iceberg.gold;\n"
+        "CREATE SCHEMA IF NOT EXISTS hive.staging "
+        "WITH (location = 's3://thailand-election2026/staging/hive/');\n"
+    )
+    tables = [dataset.create_table_sql() for dataset in SCHEMAS.values()]
+
+    return header + "\n" + "\n\n\n".join(tables) + "\n"
+
+
+if __name__ == "__main__":
+    print(iceberg_ddl(), end="")
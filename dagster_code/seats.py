@@ -0,0 +1,249 @@
+"""
+Seat projection for the House of Representatives: 400 constituency seats
+won by the leading candidate, 100 party-list seats allocated on the
+party-list votes by largest remainder (Hare quota, no threshold).
+
+Everything is vectorized with NumPy, an allocation takes a few
+milliseconds and 1000 simulations well under a second, so the projection
+is recomputed on every live snapshot (benchmarks/bench_seat_allocation.py).
+
+simulate() projects the uncounted share of the count (percent_count) by
+Monte Carlo: per simulation the remaining votes of every constituency and
+of the party list are split between the parties by a Dirichlet draw
+centred on the current vote shares. The whole count is assumed to be
+equally far along everywhere, the feed has no per-constituency progress.
+"""
+import numpy as np
+import pandas as pd
+
+
+CONSTITUENCY_SEATS = 400
+PARTY_LIST_SEATS = 100
+MAJORITY = (CONSTITUENCY_SEATS + PARTY_LIST_SEATS) // 2 + 1
+
+SIMULATIONS = 1000
+# weight of the current shares in the Dirichlet draws, higher = the
+# uncounted votes split more like the counted ones
+CONCENTRATION = 200.0
+# simulations per vectorized block, bounds the (block, constituencies,
+# candidates) arrays
+BLOCK_SIZE = 500
+
+
+def largest_remainder(votes, seats=PARTY_LIST_SEATS):
+    """
+    Seats per party for votes of shape (parties,) or (simulations, parties).
+    Every party gets floor(votes / quota) seats, the seats left go to the
+    largest remainders, ties to the lower party index.
+    """
+    votes = np.asarray(votes, dtype=float)
+    single = votes.ndim == 1
+    votes = np.atleast_2d(votes)
+
+    totals = votes.sum(axis=1, keepdims=True)
+    quotas = np.divide(votes * seats, totals, out=np.zeros_like(votes), where=totals > 0)
+
+    allocated = np.floor(quotas).astype(np.int64)
+    left = seats - allocated.sum(axis=1, keepdims=True)
+    left[totals == 0] = 0
+
+    # position of every party in its row's remainder ranking
+    order = np.argsort(-(quotas - allocated), axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(votes.shape[1]), axis=1)
+
+    allocated += ranks < left
+
+    return allocated[0] if single else allocated
+
+
+def all_parties(stats_cons, stats_party):
+    ids = pd.concat([
+        pd.to_numeric(stats_cons["party_id"]),
+        pd.to_numeric(stats_party["party_id"]),
+    ]).dropna()
+    return np.sort(ids.astype(np.int64).unique())
+
+
+def constituency_matrix(stats_cons, parties):
+    """
+    Candidate votes as a (constituencies, candidates) matrix, padded with
+    zeros, and the matching matrix of party indexes into parties (-1 for
+    padding and candidates of unknown parties).
+    """
+    df = pd.DataFrame({
+        "constituency_id": stats_cons["constituency_id"],
+        "party": pd.Index(parties).get_indexer(pd.to_numeric(stats_cons["party_id"])),
+        "vote": pd.to_numeric(stats_cons["vote"]).fillna(0).to_numpy(dtype=float),
+    })
+    df = df[df["party"] >= 0]
+
+    rows, constituencies = pd.factorize(df["constituency_id"], sort=True)
+    columns = df.groupby(rows).cumcount().to_numpy()
+    shape = (len(constituencies), columns.max() + 1 if len(df) else 0)
+
+    votes = np.zeros(shape)
+    votes[rows, columns] = df["vote"].to_numpy()
+
+    party_index = np.full(shape, -1, dtype=np.int64)
+    party_index[rows, columns] = df["party"].to_numpy()
+
+    return constituencies, votes, party_index
+
+
+def constituency_winners(votes, party_index, parties_count):
+    """
+    Constituency seats per party for votes of shape (constituencies,
+    candidates) or (simulations, constituencies, candidates). Constituencies
+    without a single vote have no winner yet.
+    """
+    lead = votes.argmax(axis=-1)
+    winners = np.take_along_axis(
+        np.broadcast_to(party_index, votes.shape), lead[..., None], axis=-1
+    )[..., 0]
+    winners = np.where(votes.max(axis=-1) > 0, winners, -1)
+
+    if winners.ndim == 1:
+        return np.bincount(winners[winners >= 0], minlength=parties_count)
+
+    # one bincount over all simulations, offset by simulation
+    simulations = winners.shape[0]
+    offsets = np.arange(simulations)[:, None] * parties_count
+    counted = (winners + offsets)[winners >= 0]
+    return np.bincount(counted, minlength=simulations * parties_count).reshape(
+        simulations, parties_count
+    )
+
+
+def project_votes(votes, share_counted, rng, concentration, size):
+    """
+    size draws of the final votes: votes plus the votes still to be
+    counted, split like votes (last axis = parties or candidates) up to
+    the Dirichlet noise. float32, the draws are the bulk of the work.
+    """
+    totals = votes.sum(axis=-1, keepdims=True)
+    shares = np.divide(votes, totals, out=np.zeros_like(votes), where=totals > 0)
+
+    # Dirichlet through normalized gammas, zero shares stay zero
+    draws = rng.standard_gamma(
+        (shares * concentration).astype(np.float32),
+        size=(size,) + votes.shape,
+        dtype=np.float32,
+    )
+    draws_total = draws.sum(axis=-1, keepdims=True)
+
+    remaining = (totals * (1 - share_counted) / share_counted).astype(np.float32)
+    np.divide(remaining, draws_total, out=draws_total, where=draws_total > 0)
+
+    draws *= draws_total
+    draws += votes.astype(np.float32)
+    return draws
+
+
+def share_counted(stats_party):
+    percent = pd.to_numeric(stats_party["percent_count"]).dropna()
+    if percent.empty or percent.iloc[0] <= 0:
+        return None
+    return min(float(percent.iloc[0]) / 100, 1.0)
+
+
+def party_votes(stats_party, parties):
+    votes = pd.Series(
+        pd.to_numeric(stats_party["party_vote"]).fillna(0).to_numpy(dtype=float),
+        index=pd.to_numeric(stats_party["party_id"]),
+    )
+    return votes.groupby(level=0).sum().reindex(parties, fill_value=0).to_numpy()
+
+
+def allocate(stats_cons, stats_party):
+    """
+    Seats per party of the current count, from the cleaned stats_cons and
+    stats_party frames. Returns a DataFrame with party_id,
+    constituency_seats, party_list_seats and total_seats.
+    """
+    parties = all_parties(stats_cons, stats_party)
+    _, votes, party_index = constituency_matrix(stats_cons, parties)
+
+    constituency = constituency_winners(votes, party_index, len(parties))
+    party_list = largest_remainder(party_votes(stats_party, parties))
+
+    return pd.DataFrame({
+        "party_id": parties,
+        "constituency_seats": constituency,
+        "party_list_seats": party_list,
+        "total_seats": constituency + party_list,
+    })
+
+
+def simulate(
+    stats_cons,
+    stats_party,
+    simulations=SIMULATIONS,
+    concentration=CONCENTRATION,
+    block_size=BLOCK_SIZE,
+    seed=None,
+):
+    """
+    Monte Carlo total seats per party over the uncounted share.
+    Returns a (simulations, parties) array of total seats and the party
+    ids of its columns. With the count complete (or its progress unknown)
+    every simulation is the current allocation.
+    """
+    parties = all_parties(stats_cons, stats_party)
+    _, votes, party_index = constituency_matrix(stats_cons, parties)
+    list_votes = party_votes(stats_party, parties)
+
+    counted = share_counted(stats_party)
+    if counted is None or counted >= 1:
+        current = (
+            constituency_winners(votes, party_index, len(parties))
+            + largest_remainder(list_votes)
+        )
+        return np.tile(current, (simulations, 1)), parties
+
+    rng = np.random.default_rng(seed)
+    blocks = []
+
+    for start in range(0, simulations, block_size):
+        size = min(block_size, simulations - start)
+
+        final_votes = project_votes(votes, counted, rng, concentration, size)
+        final_list = project_votes(list_votes, counted, rng, concentration, size)
+
+        blocks.append(
+            constituency_winners(final_votes, party_index, len(parties))
+            + largest_remainder(final_list)
+        )
+
+    return np.concatenate(blocks), parties
+
+
+def seat_projection(
+    stats_cons,
+    stats_party,
+    simulations=SIMULATIONS,
+    concentration=CONCENTRATION,
+    seed=None,
+):
+    """
+    Current seats per party plus the Monte Carlo mean, 5th and 95th
+    percentile of total seats and the probability of a majority.
+    """
+    current = allocate(stats_cons, stats_party)
+    totals, parties = simulate(
+        stats_cons,
+        stats_party,
+        simulations=simulations,
+        concentration=concentration,
+        seed=seed,
+    )
+
+    projection = pd.DataFrame({
+        "party_id": parties,
+        "projected_seats_mean": totals.mean(axis=0),
+        "projected_seats_p05": np.percentile(totals, 5, axis=0),
+        "projected_seats_p95": np.percentile(totals, 95, axis=0),
+        "majority_probability": (totals >= MAJORITY).mean(axis=0),
+    })
+
+    return current.merge(projection, on="party_id")
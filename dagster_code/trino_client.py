@@ -0,0 +1,238 @@
+import queue
+import re
+import threading
+import time
+
+import requests
+import trino
+
+
+POOL_SIZE = 4
+
+# Trino StatementStats field -> query stats key
+STATS_FIELDS = {
+    "state": "state",
+    "cpuTimeMillis": "cpu_ms",
+    "wallTimeMillis": "wall_ms",
+    "elapsedTimeMillis": "elapsed_ms",
+    "queuedTimeMillis": "queued_ms",
+    "processedRows": "processed_rows",
+    "processedBytes": "processed_bytes",
+    "physicalWrittenBytes": "written_bytes",
+    "peakMemoryBytes": "peak_memory_bytes",
+}
+
+# summed up by TrinoClient.summary
+TOTAL_FIELDS = ("cpu_ms", "wall_ms", "elapsed_ms", "written_bytes")
+
+STATEMENT_LABEL_LENGTH = 80
+
+# QueryInfo queryStats field -> query stats key, for queries run by other
+# clients (TrinoClient.query_info)
+QUERY_INFO_FIELDS = {
+    "physicalInputDataSize": "input_bytes",
+    "physicalInputPositions": "input_rows",
+    "physicalWrittenDataSize": "written_bytes",
+    "peakUserMemoryReservation": "peak_memory_bytes",
+}
+
+# airlift DataSize units, as the coordinator serializes sizes ("1.21MB")
+DATA_SIZE_UNITS = {"B": 1, "kB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4, "PB": 1024**5}
+DATA_SIZE_RE = re.compile(r"^(?P<value>[\d.]+)\s*(?P<unit>[kMGTP]?B)$")
+
+QUERY_INFO_TIMEOUT_SECONDS = 10
+
+
+class ConnectionPool:
+    """
+    Idle trino.dbapi connections of one host/user/catalog/schema and set of
+    session properties. Pools live in the process: connections (and their
+    keep-alive HTTP sessions) are reused by the clients and sessions of a
+    step, and across steps only when they share a process (in_process
+    executor). The default multiprocess executor starts every step in its
+    own process, with empty pools.
+    """
+
+    def __init__(self, connect_kwargs, session_properties, size=POOL_SIZE):
+        self.connect_kwargs = connect_kwargs
+        self.session_properties = session_properties
+        self.idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return trino.dbapi.connect(
+                **self.connect_kwargs,
+                session_properties=dict(self.session_properties),
+            )
+
+    def release(self, connection):
+        # never hand out a connection in the middle of a transaction
+        if connection.transaction is not None:
+            connection.rollback()
+
+        try:
+            self.idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connect_kwargs, session_properties, size=POOL_SIZE):
+    key = (
+        tuple(sorted(connect_kwargs.items())),
+        tuple(sorted(session_properties.items())),
+    )
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(connect_kwargs, session_properties, size)
+        return _pools[key]
+
+
+def statement_label(sql):
+    return " ".join(sql.split())[:STATEMENT_LABEL_LENGTH]
+
+
+def data_size_bytes(value):
+    if not isinstance(value, str):
+        return value
+
+    match = DATA_SIZE_RE.match(value)
+    if not match:
+        return None
+    return round(float(match.group("value")) * DATA_SIZE_UNITS[match.group("unit")])
+
+
+class StatsCursor:
+    """
+    dbapi cursor that records the query id and final Trino stats of every
+    statement once its results have been fetched.
+    """
+
+    def __init__(self, cursor, query_stats):
+        self.cursor = cursor
+        self.query_stats = query_stats
+        self.sql = None
+        self.started = None
+
+    def execute(self, sql, params=None):
+        self.sql = sql
+        self.started = time.monotonic()
+        self.cursor.execute(sql, params)
+        return self
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        self.record()
+        return rows
+
+    def record(self):
+        stats = self.cursor.stats or {}
+
+        entry = {
+            "query_id": self.cursor.query_id,
+            "statement": statement_label(self.sql),
+            "client_seconds": round(time.monotonic() - self.started, 3),
+        }
+        for field, key in STATS_FIELDS.items():
+            entry[key] = stats.get(field)
+
+        self.query_stats.append(entry)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class TrinoClient:
+    """
+    What the trino resource hands to assets: a connection leased from the
+    pool for the client's session properties, cursors that record query
+    stats, and the stats recorded so far.
+
+    session() derives a client with extra session properties (and its own
+    stats), for a single asset:
+
+        with context.resources.trino.session({"task_concurrency": "8"}) as trino:
+            ...
+            context.add_output_metadata(trino.summary())
+    """
+
+    def __init__(self, connect_kwargs, session_properties=None, pool_size=POOL_SIZE):
+        self.connect_kwargs = connect_kwargs
+        self.session_properties = dict(session_properties or {})
+        self.pool_size = pool_size
+        self.pool = get_pool(connect_kwargs, self.session_properties, pool_size)
+        self.connection = None
+        self.query_stats = []
+        self.sessions = []
+
+    def session(self, session_properties=None):
+        properties = {**self.session_properties, **(session_properties or {})}
+        client = TrinoClient(self.connect_kwargs, properties, self.pool_size)
+        self.sessions.append(client)
+        return client
+
+    def cursor(self):
+        if self.connection is None:
+            self.connection = self.pool.acquire()
+        return StatsCursor(self.connection.cursor(), self.query_stats)
+
+    def commit(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+    def rollback(self):
+        if self.connection is not None and self.connection.transaction is not None:
+            self.connection.rollback()
+
+    def query_info(self, query_id):
+        """
+        Final stats of a query run by another client (dbt), from the
+        coordinator's query info. Finished queries are only kept there for
+        a while (query.min-expire-age, 15 minutes by default).
+        """
+        response = requests.get(
+            f"http://{self.connect_kwargs['host']}:{self.connect_kwargs['port']}/v1/query/{query_id}",
+            headers={"X-Trino-User": self.connect_kwargs["user"]},
+            timeout=QUERY_INFO_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        query = response.json()
+
+        info = {"query_id": query_id, "state": query.get("state")}
+        for field, key in QUERY_INFO_FIELDS.items():
+            info[key] = data_size_bytes(query["queryStats"].get(field))
+        return info
+
+    def summary(self):
+        """
+        Totals and per-statement stats of everything run through this
+        client, shaped as asset metadata.
+        """
+        summary = {"trino_queries": len(self.query_stats)}
+
+        for key in TOTAL_FIELDS:
+            summary[f"trino_{key}"] = sum(q[key] or 0 for q in self.query_stats)
+
+        summary["trino_query_stats"] = self.query_stats
+        return summary
+
+    def close(self):
+        for client in self.sessions:
+            client.close()
+        self.sessions = []
+
+        if self.connection is not None:
+            self.pool.release(self.connection)
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
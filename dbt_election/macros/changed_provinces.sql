@@ -0,0 +1,57 @@
+{#
+    Provinces an incremental rollup of fact_vote_constituency recomputes:
+    those with a constituency whose votes or turnout moved in a snapshot
+    newer than last_ts, the newest one the rollup reflects (changes read
+    from the deltas of fact_vote_progress_constituency), and every
+    province of a day the rollup does not have yet.
+
+    A backfill or rerun of a past day recomputes every province of that
+    day: last_ts is the newest snapshot of any day, the deltas would not
+    show a corrected fact_vote_constituency.
+
+    The rollups delete+insert on (ingestion_date, province_id), the rows
+    of the other provinces are left as they are.
+#}
+
+{% macro changed_provinces(last_ts) %}
+    SELECT province_id
+    FROM {{ ref('fact_vote_progress_constituency') }}
+    WHERE
+        ingestion_date >= CAST({{ last_ts }} AS DATE)
+        AND snapshot_ts > {{ last_ts }}
+        AND (vote_delta <> 0 OR turn_out_delta <> 0 OR valid_votes_delta <> 0)
+
+    UNION
+
+    SELECT province_id
+    FROM {{ ref('fact_vote_constituency') }}
+    WHERE
+        ingestion_date = {{ snapshot_date('ods_stats_cons') }}
+        {% if not is_past_partition() %}
+        AND NOT EXISTS (
+            SELECT 1
+            FROM {{ this }}
+            WHERE ingestion_date = {{ snapshot_date('ods_stats_cons') }}
+        )
+        {% endif %}
+{% endmacro %}
+
+
+{#
+    Newest snapshot_ts per ingestion_date, stamped on the rollup rows so
+    the next run knows which snapshots it has seen (last_snapshot_ts()).
+#}
+
+{% macro rollup_snapshots(last_ts) %}
+    SELECT
+        ingestion_date,
+        max(snapshot_ts) AS snapshot_ts
+    FROM
+        {{ ref('fact_vote_progress_constituency') }}
+    {% if last_ts %}
+    WHERE
+        ingestion_date = {{ snapshot_date('ods_stats_cons') }}
+    {% endif %}
+    GROUP BY
+        ingestion_date
+{% endmacro %}
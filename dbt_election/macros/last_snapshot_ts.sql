@@ -0,0 +1,20 @@
+{#
+    Newest snapshot_ts already loaded into an incremental vote progress
+    model, as a TIMESTAMP literal, read from the Iceberg $partitions
+    column stats instead of the table data.
+    none on the first build and on --full-refresh.
+#}
+
+{% macro last_snapshot_ts() %}
+    {%- if execute and is_incremental() -%}
+        {%- set query -%}
+            SELECT max(data.snapshot_ts.max)
+            FROM {{ this.database }}.{{ this.schema }}."{{ this.identifier }}$partitions"
+        {%- endset -%}
+        {%- set latest = run_query(query).columns[0].values()[0] -%}
+        {%- if latest is not none -%}
+            {{ return("TIMESTAMP '" ~ latest ~ "'") }}
+        {%- endif -%}
+    {%- endif -%}
+    {{ return(none) }}
+{% endmacro %}
@@ -0,0 +1,61 @@
+{#
+    The ODS tables keep one snapshot per ingestion_date partition.
+    Gold models read a single snapshot through latest_snapshot() so every
+    build scans one partition, whatever the history size.
+
+    The date is rendered as a literal so Trino prunes the Iceberg
+    partitions at planning time. It comes from the DBT_INGESTION_DATE env
+    var (what Dagster sets) or the ingestion_date var when given
+    (dbt build --vars '{ingestion_date: 2026-02-08}'), otherwise from the
+    newest partition in the table's $partitions metadata table.
+
+    Both are only read at execution: an env var read while parsing, or
+    vars that change between runs, would make every build reparse the
+    project instead of reusing dbt's partial parse state.
+#}
+
+{% macro requested_ingestion_date() %}
+    {{ return(execute and (env_var('DBT_INGESTION_DATE', '') or var('ingestion_date', none))) }}
+{% endmacro %}
+
+
+{#
+    True when the build was given a day before today (UTC, like the
+    Dagster partitions): a backfill or rerun of a past partition.
+#}
+
+{% macro is_past_partition() %}
+    {%- set ingestion_date = requested_ingestion_date() -%}
+    {{ return(ingestion_date and ingestion_date | string < modules.datetime.datetime.utcnow().strftime('%Y-%m-%d')) }}
+{% endmacro %}
+
+
+{% macro snapshot_date(table_name) %}
+    {%- set ingestion_date = requested_ingestion_date() -%}
+    {%- if ingestion_date -%}
+        DATE '{{ ingestion_date }}'
+    {%- elif execute -%}
+        {%- set relation = source('silver', table_name) -%}
+        {%- set query -%}
+            SELECT max(partition.ingestion_date)
+            FROM {{ relation.database }}.{{ relation.schema }}."{{ relation.identifier }}$partitions"
+        {%- endset -%}
+        {%- set latest = run_query(query).columns[0].values()[0] -%}
+        {%- if latest is none -%}
+            CAST(NULL AS DATE)
+        {%- else -%}
+            DATE '{{ latest }}'
+        {%- endif -%}
+    {%- else -%}
+        CURRENT_DATE
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro latest_snapshot(table_name) %}
+    (
+        SELECT *
+        FROM {{ source('silver', table_name) }}
+        WHERE ingestion_date = {{ snapshot_date(table_name) }}
+    )
+{% endmacro %}
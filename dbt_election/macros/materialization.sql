@@ -0,0 +1,22 @@
+{#
+    Materialization of a model, overridable per run through the
+    materializations var ({model name: table, incremental or view}),
+    which the Dagster dbt resource sets from its config:
+
+        {{ config(materialized=materialization('table')) }}
+
+    incremental only applies to models that declare their incremental
+    strategy, a table model switched to incremental would append to itself
+    on every build.
+#}
+
+{% macro materialization(default) %}
+    {%- set materialized = var('materializations', {}).get(model.name, default) -%}
+    {%- if materialized not in ('table', 'incremental', 'view') -%}
+        {{ exceptions.raise_compiler_error(model.name ~ ": unknown materialization " ~ materialized) }}
+    {%- endif -%}
+    {%- if materialized == 'incremental' and default != 'incremental' -%}
+        {{ exceptions.raise_compiler_error(model.name ~ " has no incremental strategy, use table or view") }}
+    {%- endif -%}
+    {{ return(materialized) }}
+{% endmacro %}
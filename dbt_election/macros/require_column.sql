@@ -0,0 +1,21 @@
+{#
+    Guard for models that became incremental after their table was first
+    built: an incremental run against a table without the column (the old
+    layout) fails with the migration step instead of a column error in
+    the delete+insert.
+
+        {{ require_column('ingestion_date') }}
+#}
+
+{% macro require_column(column) %}
+    {%- if execute and is_incremental() -%}
+        {%- set columns = adapter.get_columns_in_relation(this) | map(attribute='name') | map('lower') | list -%}
+        {%- if column not in columns -%}
+            {{ exceptions.raise_compiler_error(
+                this ~ " has no " ~ column ~ " column, it was built before " ~ this.identifier
+                ~ " became incremental. Rebuild it once with: dbt build --full-refresh --select "
+                ~ this.identifier
+            ) }}
+        {%- endif -%}
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,18 @@
+{#
+    Parquet row group size of the files a model writes, for models sorted
+    with the sorted_by property: smaller row groups give the min/max
+    statistics a finer grain, so filters skip more of each file. Set and
+    reset around the model, the session is reused by the next model:
+
+        pre_hook="{{ set_row_group_size('8MB') }}",
+        post_hook="{{ reset_row_group_size() }}",
+#}
+
+{% macro set_row_group_size(size) -%}
+    SET SESSION iceberg.parquet_writer_block_size = '{{ size }}'
+{%- endmacro %}
+
+
+{% macro reset_row_group_size() -%}
+    RESET SESSION iceberg.parquet_writer_block_size
+{%- endmacro %}
@@ -0,0 +1,82 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='delete+insert',
+    unique_key=['ingestion_date', 'province_id'],
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['province_id', 'party_id']",
+    },
+    )
+}}
+
+{#
+    Votes per party and province. Incremental runs only recompute the
+    provinces that changed since the last run, see changed_provinces().
+#}
+
+{% set last_ts = last_snapshot_ts() %}
+
+WITH facts AS (
+
+    SELECT
+        province_id,
+        constituency_id,
+        party_id,
+        vote,
+        valid_votes,
+        ingestion_date
+    FROM
+        {{ ref('fact_vote_constituency') }}
+    {% if last_ts %}
+    WHERE
+        ingestion_date = {{ snapshot_date('ods_stats_cons') }}
+        AND province_id IN ({{ changed_provinces(last_ts) }})
+    {% endif %}
+
+),
+
+-- valid_votes repeats on every candidate row of a constituency
+province_valid_votes AS (
+
+    SELECT
+        ingestion_date,
+        province_id,
+        sum(valid_votes) AS valid_votes
+    FROM (
+        SELECT DISTINCT ingestion_date, province_id, constituency_id, valid_votes
+        FROM facts
+    )
+    GROUP BY
+        ingestion_date,
+        province_id
+
+),
+
+snapshots AS (
+
+    {{ rollup_snapshots(last_ts) }}
+
+)
+
+SELECT
+    f.province_id,
+    f.party_id,
+    coalesce(sum(f.vote), 0) AS vote,
+    CAST(coalesce(sum(f.vote), 0) AS DOUBLE) * 100 / nullif(v.valid_votes, 0) AS vote_percent,
+    count(*) AS candidates,
+    s.snapshot_ts,
+    f.ingestion_date
+FROM
+    facts f
+    JOIN province_valid_votes v
+        ON v.ingestion_date = f.ingestion_date
+        AND v.province_id = f.province_id
+    LEFT JOIN snapshots s
+        ON s.ingestion_date = f.ingestion_date
+GROUP BY
+    f.province_id,
+    f.party_id,
+    v.valid_votes,
+    s.snapshot_ts,
+    f.ingestion_date
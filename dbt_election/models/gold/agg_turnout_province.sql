@@ -0,0 +1,67 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='delete+insert',
+    unique_key=['ingestion_date', 'province_id'],
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['province_id']",
+    },
+    )
+}}
+
+{#
+    Turnout totals per province. Incremental runs only recompute the
+    provinces that changed since the last run, see changed_provinces().
+#}
+
+{% set last_ts = last_snapshot_ts() %}
+
+WITH constituencies AS (
+
+    -- the turnout columns repeat on every candidate row of a constituency
+    SELECT DISTINCT
+        province_id,
+        constituency_id,
+        turn_out,
+        valid_votes,
+        invalid_votes,
+        blank_votes,
+        ingestion_date
+    FROM
+        {{ ref('fact_vote_constituency') }}
+    {% if last_ts %}
+    WHERE
+        ingestion_date = {{ snapshot_date('ods_stats_cons') }}
+        AND province_id IN ({{ changed_provinces(last_ts) }})
+    {% endif %}
+
+),
+
+snapshots AS (
+
+    {{ rollup_snapshots(last_ts) }}
+
+)
+
+SELECT
+    c.province_id,
+    count(*) AS constituencies,
+    sum(d.registered_vote) AS registered_vote,
+    sum(c.turn_out) AS turn_out,
+    CAST(sum(c.turn_out) AS DOUBLE) * 100 / nullif(sum(d.registered_vote), 0) AS percent_turn_out,
+    sum(c.valid_votes) AS valid_votes,
+    sum(c.invalid_votes) AS invalid_votes,
+    sum(c.blank_votes) AS blank_votes,
+    s.snapshot_ts,
+    c.ingestion_date
+FROM
+    constituencies c
+    LEFT JOIN {{ ref('dim_constituency') }} d
+        ON d.constituency_id = c.constituency_id
+    LEFT JOIN snapshots s
+        ON s.ingestion_date = c.ingestion_date
+GROUP BY
+    c.province_id,
+    s.snapshot_ts,
+    c.ingestion_date
@@ -0,0 +1,83 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='delete+insert',
+    unique_key=['ingestion_date', 'province_id'],
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['province_id', 'party_id']",
+    },
+    )
+}}
+
+{#
+    Constituency seats led (rank = 1) per party and province, with the
+    closest lead over the runner-up. Incremental runs only recompute the
+    provinces that changed since the last run, see changed_provinces().
+#}
+
+{% set last_ts = last_snapshot_ts() %}
+
+WITH facts AS (
+
+    SELECT
+        province_id,
+        constituency_id,
+        party_id,
+        vote,
+        rank,
+        ingestion_date
+    FROM
+        {{ ref('fact_vote_constituency') }}
+    WHERE
+        rank IN (1, 2)
+        {% if last_ts %}
+        AND ingestion_date = {{ snapshot_date('ods_stats_cons') }}
+        AND province_id IN ({{ changed_provinces(last_ts) }})
+        {% endif %}
+
+),
+
+winners AS (
+
+    SELECT
+        ingestion_date,
+        province_id,
+        constituency_id,
+        max(CASE WHEN rank = 1 THEN party_id END) AS party_id,
+        max(CASE WHEN rank = 1 THEN vote END) AS vote,
+        max(CASE WHEN rank = 2 THEN vote END) AS runner_up_vote
+    FROM
+        facts
+    GROUP BY
+        ingestion_date,
+        province_id,
+        constituency_id
+    HAVING
+        count_if(rank = 1) > 0
+
+),
+
+snapshots AS (
+
+    {{ rollup_snapshots(last_ts) }}
+
+)
+
+SELECT
+    w.province_id,
+    w.party_id,
+    count(*) AS seats,
+    sum(w.vote) AS vote,
+    min(w.vote - coalesce(w.runner_up_vote, 0)) AS closest_margin,
+    s.snapshot_ts,
+    w.ingestion_date
+FROM
+    winners w
+    LEFT JOIN snapshots s
+        ON s.ingestion_date = w.ingestion_date
+GROUP BY
+    w.province_id,
+    w.party_id,
+    s.snapshot_ts,
+    w.ingestion_date
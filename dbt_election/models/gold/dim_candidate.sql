@@ -1,3 +1,5 @@
+{{ config(materialized=materialization('table')) }}
+
 SELECT
     mp_candidate_id,
     candidate_no,
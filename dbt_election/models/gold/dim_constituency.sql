@@ -1,3 +1,5 @@
+{{ config(materialized=materialization('table')) }}
+
 SELECT 
     constituency_id ,
     constituency_no ,
@@ -6,5 +8,5 @@ SELECT
     total_vote_stations ,
     registered_vote 
 FROM
-    {{ source('silver', 'ods_constituency') }}
+    {{ latest_snapshot('ods_constituency') }} AS snapshot
     
\ No newline at end of file
@@ -1,3 +1,5 @@
+{{ config(materialized=materialization('table')) }}
+
 SELECT
     *
 FROM 
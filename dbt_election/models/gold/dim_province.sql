@@ -1,3 +1,5 @@
+{{ config(materialized=materialization('table')) }}
+
 SELECT 
     province_id ,
     prov_id ,
@@ -5,4 +7,4 @@ SELECT
     abbre_thai,
     eng     
 FROM
-    {{ source('silver', 'ods_province') }}
\ No newline at end of file
+    {{ latest_snapshot('ods_province') }} AS snapshot
\ No newline at end of file
@@ -1,3 +1,22 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='delete+insert',
+    unique_key='ingestion_date',
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['province_id', 'constituency_id']",
+    },
+    )
+}}
+
+{#
+    Incremental and partitioned by ingestion_date since the gold layer
+    reads one ODS snapshot per build. Tables built before need a one-off
+    dbt build --full-refresh --select fact_vote_constituency.
+#}
+{{ require_column('ingestion_date') }}
+
 SELECT 
     constituency_id ,
     province_id ,
@@ -9,7 +28,8 @@ SELECT
     percent_turn_out ,
     valid_votes ,
     invalid_votes ,
-    blank_votes 
+    blank_votes ,
+    ingestion_date
    
 FROM
-    {{ source('silver', 'ods_stats_cons') }}
\ No newline at end of file
+    {{ latest_snapshot('ods_stats_cons') }} AS snapshot
@@ -1,3 +1,22 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='delete+insert',
+    unique_key='ingestion_date',
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['party_id']",
+    },
+    )
+}}
+
+{#
+    Incremental and partitioned by ingestion_date since the gold layer
+    reads one ODS snapshot per build. Tables built before need a one-off
+    dbt build --full-refresh --select fact_vote_party.
+#}
+{{ require_column('ingestion_date') }}
+
 SELECT
     coalesce(dim_party_id, -1) as party_id,
     party_vote,
@@ -6,7 +25,8 @@ SELECT
     mp_app_vote_percent,
     first_mp_app_count,
     counted_vote_stations,
-    percent_count
+    percent_count,
+    ingestion_date
 
 FROM 
-    {{ ref('int_stats_party_join_party') }}
\ No newline at end of file
+    {{ ref('int_stats_party_join_party') }}
@@ -0,0 +1,150 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='append',
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['province_id', 'constituency_id', 'snapshot_ts']",
+    },
+    pre_hook="{{ set_row_group_size('8MB') }}",
+    post_hook="{{ reset_row_group_size() }}",
+    )
+}}
+
+{#
+    Candidate votes and constituency turnout of every snapshot of the
+    night, with the change since the previous snapshot. Incremental runs
+    only read the snapshots newer than the last one loaded, plus that last
+    one as the baseline for the first delta.
+#}
+
+{% set last_ts = last_snapshot_ts() %}
+
+WITH snapshots AS (
+
+    SELECT
+        constituency_id,
+        province_id,
+        coalesce(party_id, -1) as party_id,
+        vote,
+        rank,
+        turn_out,
+        percent_turn_out,
+        valid_votes,
+        batch_id,
+        snapshot_ts,
+        ingestion_date,
+        min(ingestion_date) OVER (PARTITION BY batch_id) AS first_ingestion_date
+    FROM
+        {{ source('silver', 'ods_stats_cons_snapshot') }}
+    {% if last_ts %}
+    WHERE
+        ingestion_date >= CAST({{ last_ts }} AS DATE)
+        AND snapshot_ts > {{ last_ts }}
+    {% endif %}
+
+),
+
+-- a snapshot unchanged across midnight is loaded into the next day too,
+-- keep the first copy
+new_snapshots AS (
+
+    SELECT
+        constituency_id,
+        province_id,
+        party_id,
+        vote,
+        rank,
+        turn_out,
+        percent_turn_out,
+        valid_votes,
+        batch_id,
+        snapshot_ts,
+        ingestion_date
+    FROM
+        snapshots
+    WHERE
+        ingestion_date = first_ingestion_date
+
+),
+
+baseline AS (
+
+    SELECT
+        constituency_id,
+        province_id,
+        party_id,
+        vote,
+        rank,
+        turn_out,
+        percent_turn_out,
+        valid_votes,
+        batch_id,
+        snapshot_ts,
+        ingestion_date
+    {% if last_ts %}
+    FROM
+        {{ this }}
+    WHERE
+        ingestion_date >= CAST({{ last_ts }} AS DATE)
+        AND snapshot_ts = {{ last_ts }}
+    {% else %}
+    FROM
+        new_snapshots
+    WHERE
+        false
+    {% endif %}
+
+),
+
+series AS (
+
+    SELECT *, false AS is_baseline FROM new_snapshots
+    UNION ALL
+    SELECT *, true AS is_baseline FROM baseline
+
+),
+
+deltas AS (
+
+    SELECT
+        constituency_id,
+        province_id,
+        party_id,
+        snapshot_ts,
+        batch_id,
+        vote,
+        vote - coalesce(lag(vote) OVER w, 0) AS vote_delta,
+        rank,
+        turn_out,
+        turn_out - coalesce(lag(turn_out) OVER w, 0) AS turn_out_delta,
+        percent_turn_out,
+        valid_votes,
+        valid_votes - coalesce(lag(valid_votes) OVER w, 0) AS valid_votes_delta,
+        ingestion_date,
+        is_baseline
+    FROM
+        series
+    WINDOW w AS (PARTITION BY constituency_id, party_id ORDER BY snapshot_ts)
+
+)
+
+SELECT
+    constituency_id,
+    province_id,
+    party_id,
+    snapshot_ts,
+    batch_id,
+    vote,
+    vote_delta,
+    rank,
+    turn_out,
+    turn_out_delta,
+    percent_turn_out,
+    valid_votes,
+    valid_votes_delta,
+    ingestion_date
+FROM
+    deltas
+WHERE
+    NOT is_baseline
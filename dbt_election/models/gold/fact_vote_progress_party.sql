@@ -0,0 +1,138 @@
+{{ config(
+    materialized=materialization('incremental'),
+    incremental_strategy='append',
+    properties={
+        "format": "'PARQUET'",
+        "partitioning": "ARRAY['ingestion_date']",
+        "sorted_by": "ARRAY['party_id', 'snapshot_ts']",
+    },
+    )
+}}
+
+{#
+    Party vote counts of every snapshot of the night, with the change
+    since the previous snapshot. Incremental runs only read the snapshots
+    newer than the last one loaded, plus that last one as the baseline
+    for the first delta.
+#}
+
+{% set last_ts = last_snapshot_ts() %}
+
+WITH snapshots AS (
+
+    SELECT
+        coalesce(party_id, -1) as party_id,
+        party_vote,
+        mp_app_vote,
+        first_mp_app_count,
+        counted_vote_stations,
+        percent_count,
+        batch_id,
+        snapshot_ts,
+        ingestion_date,
+        min(ingestion_date) OVER (PARTITION BY batch_id) AS first_ingestion_date
+    FROM
+        {{ source('silver', 'ods_stats_party_snapshot') }}
+    {% if last_ts %}
+    WHERE
+        ingestion_date >= CAST({{ last_ts }} AS DATE)
+        AND snapshot_ts > {{ last_ts }}
+    {% endif %}
+
+),
+
+-- a snapshot unchanged across midnight is loaded into the next day too,
+-- keep the first copy
+new_snapshots AS (
+
+    SELECT
+        party_id,
+        party_vote,
+        mp_app_vote,
+        first_mp_app_count,
+        counted_vote_stations,
+        percent_count,
+        batch_id,
+        snapshot_ts,
+        ingestion_date
+    FROM
+        snapshots
+    WHERE
+        ingestion_date = first_ingestion_date
+
+),
+
+baseline AS (
+
+    SELECT
+        party_id,
+        party_vote,
+        mp_app_vote,
+        first_mp_app_count,
+        counted_vote_stations,
+        percent_count,
+        batch_id,
+        snapshot_ts,
+        ingestion_date
+    {% if last_ts %}
+    FROM
+        {{ this }}
+    WHERE
+        ingestion_date >= CAST({{ last_ts }} AS DATE)
+        AND snapshot_ts = {{ last_ts }}
+    {% else %}
+    FROM
+        new_snapshots
+    WHERE
+        false
+    {% endif %}
+
+),
+
+series AS (
+
+    SELECT *, false AS is_baseline FROM new_snapshots
+    UNION ALL
+    SELECT *, true AS is_baseline FROM baseline
+
+),
+
+deltas AS (
+
+    SELECT
+        party_id,
+        snapshot_ts,
+        batch_id,
+        percent_count,
+        percent_count - coalesce(lag(percent_count) OVER w, 0) AS percent_count_delta,
+        counted_vote_stations,
+        party_vote,
+        party_vote - coalesce(lag(party_vote) OVER w, 0) AS party_vote_delta,
+        mp_app_vote,
+        mp_app_vote - coalesce(lag(mp_app_vote) OVER w, 0) AS mp_app_vote_delta,
+        first_mp_app_count,
+        ingestion_date,
+        is_baseline
+    FROM
+        series
+    WINDOW w AS (PARTITION BY party_id ORDER BY snapshot_ts)
+
+)
+
+SELECT
+    party_id,
+    snapshot_ts,
+    batch_id,
+    percent_count,
+    percent_count_delta,
+    counted_vote_stations,
+    party_vote,
+    party_vote_delta,
+    mp_app_vote,
+    mp_app_vote_delta,
+    first_mp_app_count,
+    ingestion_date
+FROM
+    deltas
+WHERE
+    NOT is_baseline
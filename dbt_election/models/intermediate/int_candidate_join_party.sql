@@ -10,7 +10,7 @@ WITH ods_mp_candidate AS (
         candidate_no,
         party_id,
         candidate_name
-    FROM {{ source('silver', 'ods_mp_candidate') }}
+    FROM {{ latest_snapshot('ods_mp_candidate') }} AS snapshot
 
 )
 
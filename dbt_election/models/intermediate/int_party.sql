@@ -11,7 +11,7 @@ WITH ods_party AS (
         party_name,
         party_abbr
     FROM 
-        {{ source('silver', 'ods_party') }}
+        {{ latest_snapshot('ods_party') }} AS snapshot
 
 )
 
@@ -8,7 +8,7 @@ WITH ods_stats_party AS (
     SELECT
         *
     FROM 
-        {{ source('silver', 'ods_stats_party') }}
+        {{ latest_snapshot('ods_stats_party') }} AS snapshot
 
 )
 
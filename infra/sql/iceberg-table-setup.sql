@@ -1,15 +1,16 @@
 CREATE SCHEMA IF NOT EXISTS iceberg.silver;
 CREATE SCHEMA IF NOT EXISTS iceberg.gold;
+CREATE SCHEMA IF NOT EXISTS hive.staging WITH (location = 's3://thailand-election2026/staging/hive/');
 
 CREATE TABLE IF NOT EXISTS iceberg.silver.ods_constituency (
     constituency_id VARCHAR,
-    constituency_no INTEGER,
+    constituency_no INTEGER NOT NULL,
     prov_id VARCHAR,
     zone VARCHAR,
-    total_vote_stations INTEGER,
-    registered_vote INTEGER,
-    ingestion_date DATE
-)   
+    total_vote_stations INTEGER NOT NULL,
+    registered_vote INTEGER NOT NULL,
+    ingestion_date DATE NOT NULL
+)
 WITH (
     format = 'PARQUET',
     partitioning = ARRAY['ingestion_date']
@@ -18,11 +19,11 @@ WITH (
 
 CREATE TABLE IF NOT EXISTS iceberg.silver.ods_mp_candidate (
     mp_candidate_id VARCHAR,
-    candidate_no INTEGER,
-    party_id INTEGER,
+    candidate_no INTEGER NOT NULL,
+    party_id INTEGER NOT NULL,
     candidate_name VARCHAR,
     image_url VARCHAR,
-    ingestion_date DATE
+    ingestion_date DATE NOT NULL
 )
 WITH (
     format = 'PARQUET',
@@ -35,7 +36,7 @@ CREATE TABLE IF NOT EXISTS iceberg.silver.ods_party_candidate (
     list_no INTEGER,
     candidate_name VARCHAR,
     image_url VARCHAR,
-    ingestion_date DATE
+    ingestion_date DATE NOT NULL
 )
 WITH (
     format = 'PARQUET',
@@ -50,7 +51,7 @@ CREATE TABLE IF NOT EXISTS iceberg.silver.ods_party (
     party_abbr VARCHAR,
     party_color VARCHAR,
     logo_url VARCHAR,
-    ingestion_date DATE
+    ingestion_date DATE NOT NULL
 )
 WITH (
     format = 'PARQUET',
@@ -58,17 +59,17 @@ WITH (
 );
 
 
- CREATE TABLE IF NOT EXISTS iceberg.silver.ods_province (
+CREATE TABLE IF NOT EXISTS iceberg.silver.ods_province (
     province_id INTEGER,
     prov_id VARCHAR,
     province VARCHAR,
     abbre_thai VARCHAR,
     eng VARCHAR,
-    ingestion_date DATE
+    ingestion_date DATE NOT NULL
 )
-    WITH (
-        format = 'PARQUET',
-        partitioning = ARRAY['ingestion_date']
+WITH (
+    format = 'PARQUET',
+    partitioning = ARRAY['ingestion_date']
 );
 
 
@@ -84,11 +85,12 @@ CREATE TABLE IF NOT EXISTS iceberg.silver.ods_stats_cons (
     valid_votes INTEGER,
     invalid_votes INTEGER,
     blank_votes INTEGER,
-    ingestion_date DATE
+    ingestion_date DATE NOT NULL
 )
-    WITH (
-        format = 'PARQUET',
-        partitioning = ARRAY['ingestion_date']
+WITH (
+    format = 'PARQUET',
+    partitioning = ARRAY['ingestion_date'],
+    sorted_by = ARRAY['province_id', 'constituency_id']
 );
 
 
@@ -101,12 +103,72 @@ CREATE TABLE IF NOT EXISTS iceberg.silver.ods_stats_party (
     first_mp_app_count INTEGER,
     counted_vote_stations INTEGER,
     percent_count DOUBLE,
-    ingestion_date DATE
+    ingestion_date DATE NOT NULL
+)
+WITH (
+    format = 'PARQUET',
+    partitioning = ARRAY['ingestion_date']
+);
+
+
+CREATE TABLE IF NOT EXISTS iceberg.silver.ods_stats_cons_snapshot (
+    constituency_id VARCHAR,
+    province_id VARCHAR,
+    party_id INTEGER,
+    vote INTEGER,
+    vote_percent DOUBLE,
+    rank INTEGER,
+    turn_out INTEGER,
+    percent_turn_out DOUBLE,
+    valid_votes INTEGER,
+    invalid_votes INTEGER,
+    blank_votes INTEGER,
+    ingestion_date DATE NOT NULL,
+    batch_id VARCHAR NOT NULL,
+    snapshot_ts TIMESTAMP(6) NOT NULL
 )
-    WITH (
-        format = 'PARQUET',
-        partitioning = ARRAY['ingestion_date']
+WITH (
+    format = 'PARQUET',
+    partitioning = ARRAY['ingestion_date', 'batch_id'],
+    sorted_by = ARRAY['province_id', 'constituency_id']
 );
 
 
+CREATE TABLE IF NOT EXISTS iceberg.silver.ods_stats_party_snapshot (
+    party_id INTEGER,
+    party_vote INTEGER,
+    party_vote_percent DOUBLE,
+    mp_app_vote INTEGER,
+    mp_app_vote_percent DOUBLE,
+    first_mp_app_count INTEGER,
+    counted_vote_stations INTEGER,
+    percent_count DOUBLE,
+    ingestion_date DATE NOT NULL,
+    batch_id VARCHAR NOT NULL,
+    snapshot_ts TIMESTAMP(6) NOT NULL
+)
+WITH (
+    format = 'PARQUET',
+    partitioning = ARRAY['ingestion_date', 'batch_id']
+);
+
 
+CREATE TABLE IF NOT EXISTS iceberg.gold.seat_projection (
+    party_id INTEGER NOT NULL,
+    constituency_seats INTEGER NOT NULL,
+    party_list_seats INTEGER NOT NULL,
+    total_seats INTEGER NOT NULL,
+    projected_seats_mean DOUBLE,
+    projected_seats_p05 DOUBLE,
+    projected_seats_p95 DOUBLE,
+    majority_probability DOUBLE,
+    simulations INTEGER,
+    percent_count DOUBLE,
+    ingestion_date DATE NOT NULL,
+    batch_id VARCHAR NOT NULL,
+    snapshot_ts TIMESTAMP(6) NOT NULL
+)
+WITH (
+    format = 'PARQUET',
+    partitioning = ARRAY['ingestion_date']
+);